@@ -0,0 +1,85 @@
+"""
+Throughput comparison: sync (WSGI) vs async (ASGI + motor) read endpoints
+Start one single-worker server of each kind against the same database, then:
+
+    gunicorn employee_management.wsgi:application -w 1 -b 127.0.0.1:8000
+    ASYNC_VIEWS=1 uvicorn employee_management.asgi:application --workers 1 --port 8001
+    python bench_async.py http://127.0.0.1:8000 http://127.0.0.1:8001 [seconds]
+
+Each request gets a unique query parameter so it misses the response cache
+and measures the database path.
+"""
+import itertools
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CONCURRENCY_LEVELS = (1, 8, 32, 64)
+
+
+def discover_paths(base_url):
+    """Read endpoints to exercise, using an existing employee"""
+    employees = requests.get(f'{base_url}/api/employees/?limit=1', timeout=30).json()['data']
+    if not employees:
+        raise SystemExit('No employees found; seed some data first')
+    employee = employees[0]
+    return [
+        '/api/employees/?limit=50',
+        f"/api/employees/{employee['id']}/",
+        '/api/attendance/?limit=50',
+        f"/api/employees/{employee['employeeId']}/attendance/",
+    ]
+
+
+def run(base_url, paths, concurrency, seconds):
+    """Requests per second for `concurrency` clients looping over paths"""
+    deadline = time.monotonic() + seconds
+    counter = itertools.count()
+    completed = []
+    errors = []
+    lock = threading.Lock()
+
+    def client():
+        session = requests.Session()
+        done = failed = 0
+        while time.monotonic() < deadline:
+            n = next(counter)
+            path = paths[n % len(paths)]
+            separator = '&' if '?' in path else '?'
+            try:
+                response = session.get(f'{base_url}{path}{separator}_bench={n}', timeout=60)
+                if response.status_code == 200:
+                    done += 1
+                else:
+                    failed += 1
+            except requests.RequestException:
+                failed += 1
+        with lock:
+            completed.append(done)
+            errors.append(failed)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    elapsed = time.monotonic() - started
+    return sum(completed) / elapsed, sum(errors)
+
+
+def main(sync_url, async_url, seconds):
+    paths = discover_paths(sync_url)
+    print(f"{'clients':>8} {'sync req/s':>12} {'async req/s':>12} {'ratio':>7}")
+    for concurrency in CONCURRENCY_LEVELS:
+        sync_rps, sync_errors = run(sync_url, paths, concurrency, seconds)
+        async_rps, async_errors = run(async_url, paths, concurrency, seconds)
+        note = f'  ({sync_errors} sync / {async_errors} async errors)' if sync_errors or async_errors else ''
+        print(f"{concurrency:>8} {sync_rps:>12.1f} {async_rps:>12.1f} {(async_rps / sync_rps if sync_rps else 0):>6.2f}x{note}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        raise SystemExit(__doc__)
+    main(sys.argv[1].rstrip('/'), sys.argv[2].rstrip('/'), float(sys.argv[3]) if len(sys.argv) > 3 else 10)
@@ -0,0 +1,92 @@
+"""
+Microbenchmark: attendance pattern analysis (employees/attendance_patterns.py) for a whole roster
+No database is needed; attendance is generated in memory like seed_synthetic's.
+
+    python bench_patterns.py [employees] [days]
+
+Times expanding month bitmask documents into the employees x days matrix
+and computing every metric on it; the target is well under a second for
+20000 employees x 365 days.
+"""
+import os
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+import numpy as np  # noqa: E402
+from bson import ObjectId  # noqa: E402
+from employees import attendance_patterns  # noqa: E402
+from employees.synthetic import ABSENCE_ALPHA, ABSENCE_BETA  # noqa: E402
+
+TARGET_SECONDS = 1.0
+
+
+def make_codes(employees, days, start, seed=42):
+    """Status matrix: weekdays marked, each employee absent at a Beta(2, 25) rate"""
+    rng = np.random.default_rng(seed)
+    weekdays = (start.weekday() + np.arange(days)) % 7 < 5
+    absence_rates = rng.beta(ABSENCE_ALPHA, ABSENCE_BETA, size=(employees, 1))
+    absent = rng.random((employees, days)) < absence_rates
+    codes = np.where(absent, attendance_patterns.ABSENT, attendance_patterns.PRESENT).astype(np.int8)
+    codes[:, ~weekdays] = attendance_patterns.UNMARKED
+    return codes
+
+
+def month_documents(codes, employee_ids, start):
+    """Pack a status matrix into attendance_monthly documents"""
+    documents = []
+    day, end = start, start + timedelta(days=codes.shape[1] - 1)
+    while day <= end:
+        month = datetime(day.year, day.month, 1)
+        next_month = (month + timedelta(days=32)).replace(day=1).date()
+        first, last = (day - start).days, (min(next_month - timedelta(days=1), end) - start).days + 1
+        bits = np.left_shift(1, np.arange(day.day - 1, day.day - 1 + last - first, dtype=np.int64))
+        present = (codes[:, first:last] == attendance_patterns.PRESENT) @ bits
+        absent = (codes[:, first:last] == attendance_patterns.ABSENT) @ bits
+        documents.extend(
+            {'employee': employee_id, 'month': month, 'present': int(p), 'absent': int(a)}
+            for employee_id, p, a in zip(employee_ids, present, absent)
+        )
+        day = next_month
+    return documents
+
+
+def best_of(func, repeat=3):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main(employees, days):
+    start = date.today() - timedelta(days=days - 1)
+    codes = make_codes(employees, days, start)
+    employee_ids = [ObjectId() for _ in range(employees)]
+    index = {employee_id: position for position, employee_id in enumerate(employee_ids)}
+    documents = month_documents(codes, employee_ids, start)
+
+    assert (attendance_patterns.matrix_from_months(documents, index, start, days) == codes).all()
+    # The collection is read without a sort, so the expansion must not depend on document order
+    shuffled = [documents[i] for i in np.random.default_rng(7).permutation(len(documents))]
+    assert (attendance_patterns.matrix_from_months(shuffled, index, start, days) == codes).all()
+
+    expand = best_of(lambda: attendance_patterns.matrix_from_months(documents, index, start, days))
+    compute = best_of(lambda: attendance_patterns.compute(codes, start))
+    metrics = attendance_patterns.compute(codes, start)
+
+    print(f"{employees} employees x {days} days ({int((codes > 0).sum())} records, {len(documents)} month documents)")
+    print(f"expand month documents: {expand * 1000:8.1f} ms")
+    print(f"compute metrics:        {compute * 1000:8.1f} ms")
+    print(f"total:                  {(expand + compute) * 1000:8.1f} ms   (target < {TARGET_SECONDS * 1000:.0f} ms)")
+    print(f"longest absence streak: {int(metrics['longest_absence_streak'].max())} days, "
+          f"frequent Monday absences: {int(metrics['frequent_monday_absences'].sum())} employees")
+    return 0 if expand + compute < TARGET_SECONDS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 365,
+    ))
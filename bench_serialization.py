@@ -0,0 +1,90 @@
+"""
+Microbenchmark: per-record serialization cost of the Document path vs the raw dict path
+No database is needed; documents are built in memory.
+
+    python bench_serialization.py [records]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from bson import ObjectId  # noqa: E402
+from employees.models import Employee  # noqa: E402
+from employees.attendance_models import Attendance  # noqa: E402
+from employees.serializers import EmployeeSerializer, employee_to_dict  # noqa: E402
+from employees.attendance_serializers import AttendanceSerializer, attendance_list_to_dicts  # noqa: E402
+
+
+def make_documents(count):
+    """Raw documents shaped like the ones MongoDB returns"""
+    employees = [
+        {
+            '_id': ObjectId(),
+            'employeeId': f'EMP{i:05d}',
+            'full_name': f'Employee {i}',
+            'email': f'employee{i}@example.com',
+            'department': 'Engineering',
+        }
+        for i in range(max(count // 20, 1))
+    ]
+    start = datetime(2024, 1, 1)
+    attendance = [
+        {
+            '_id': ObjectId(),
+            'employee': employees[i % len(employees)]['_id'],
+            'date': start + timedelta(days=i // len(employees)),
+            'status': 'Present' if i % 7 else 'Absent',
+            'created_at': start + timedelta(days=i // len(employees), seconds=i),
+        }
+        for i in range(count)
+    ]
+    return employees, attendance
+
+
+def per_record_us(func, records, repeat=5):
+    """Best-of-N time per record, in microseconds"""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) / records * 1e6
+
+
+def print_result(title, document_us, raw_us):
+    print(f"{title:<12} document path: {document_us:7.2f} µs/record   "
+          f"raw dict path: {raw_us:6.2f} µs/record   speedup: {document_us / raw_us:4.1f}x")
+
+
+def main(count):
+    employee_sons, attendance_sons = make_documents(count)
+    employee_map = {son['_id']: son for son in employee_sons}
+
+    def employees_as_documents():
+        documents = [Employee._from_son(son) for son in employee_sons]
+        return EmployeeSerializer(documents, many=True).data
+
+    def employees_as_dicts():
+        return [employee_to_dict(son) for son in employee_sons]
+
+    def attendance_as_documents():
+        # Hydrate rows as the ORM would, then serialize (employees come from the cache in both paths)
+        documents = [Attendance._from_son(son) for son in attendance_sons]
+        return AttendanceSerializer(documents, many=True, context={'employee_map': employee_map}).data
+
+    def attendance_as_dicts():
+        return attendance_list_to_dicts(attendance_sons, employee_map)
+
+    assert employees_as_documents() == employees_as_dicts()
+    assert attendance_as_documents() == attendance_as_dicts()
+
+    print(f"Serializing {count} attendance records ({len(employee_sons)} employees)")
+    print_result('employees', per_record_us(employees_as_documents, len(employee_sons)),
+                 per_record_us(employees_as_dicts, len(employee_sons)))
+    print_result('attendance', per_record_us(attendance_as_documents, count),
+                 per_record_us(attendance_as_dicts, count))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
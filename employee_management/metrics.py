@@ -0,0 +1,148 @@
+"""
+Prometheus metrics, served at /api/metrics/
+
+Request latency is labelled with the URL name from employees/urls.py, so
+/api/employees/<id>/ is one series however many ids are requested.
+
+With several gunicorn workers each process writes its samples to
+PROMETHEUS_MULTIPROC_DIR (set by gunicorn.conf.py) and the endpoint merges
+every worker's files, whichever worker answers the scrape. The variable
+must be set before prometheus_client is imported.
+"""
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+
+# Methods kept as label values; anything else a client sends is counted as "other",
+# so arbitrary method names cannot create new series
+HTTP_METHODS = frozenset(('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'))
+
+# MongoDB commands and pool checkouts are mostly sub-millisecond
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+http_requests = Counter(
+    'http_requests_total',
+    'HTTP requests by URL name, method and status code',
+    ['route', 'method', 'status']
+)
+http_request_duration = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by URL name, method and status code',
+    ['route', 'method', 'status']
+)
+mongo_command_duration = Histogram(
+    'mongodb_command_duration_seconds',
+    'MongoDB command latency by command name',
+    ['command'],
+    buckets=MONGO_BUCKETS
+)
+mongo_command_failures = Counter(
+    'mongodb_command_failures_total',
+    'Failed MongoDB commands by command name',
+    ['command']
+)
+mongo_pool_wait = Histogram(
+    'mongodb_pool_checkout_wait_seconds',
+    'Time spent waiting to check a connection out of the pool',
+    buckets=MONGO_BUCKETS
+)
+mongo_pool_checkout_failures = Counter(
+    'mongodb_pool_checkout_failures_total',
+    'Failed pool checkouts by reason (timeout, connectionError, poolClosed)',
+    ['reason']
+)
+mongo_connections_open = Gauge(
+    'mongodb_pool_connections_open',
+    'Open pooled connections, summed over live workers',
+    multiprocess_mode='livesum'
+)
+
+
+def route_name(request):
+    """
+    URL name the request resolved to, or "unmatched" (e.g. a 404 or a redirect)
+    """
+    match = getattr(request, 'resolver_match', None)
+    return (match.url_name if match else None) or 'unmatched'
+
+
+def method_name(request):
+    """
+    Request method, or "other" for one outside HTTP_METHODS
+    """
+    return request.method if request.method in HTTP_METHODS else 'other'
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Records every MongoDB command's latency
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongo_command_duration.labels(event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        mongo_command_duration.labels(event.command_name).observe(event.duration_micros / 1e6)
+        mongo_command_failures.labels(event.command_name).inc()
+
+
+command_metrics = CommandMetricsListener()
+
+
+class MetricsMiddleware:
+    """
+    Counts requests and records their latency per URL name
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, started)
+        return response
+
+    def record(self, request, response, started):
+        labels = (route_name(request), method_name(request), str(response.status_code))
+        http_requests.labels(*labels).inc()
+        http_request_duration.labels(*labels).observe(time.perf_counter() - started)
+
+
+def render_latest():
+    """
+    (body, content type) of the current metrics, merged across workers in multiprocess mode
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
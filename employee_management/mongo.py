@@ -0,0 +1,155 @@
+"""
+MongoDB connection setup and connection pool statistics
+
+settings.py registers the connection without opening it: the client
+(handshake, authentication, pool) is created on first use in each process,
+so management commands that never touch MongoDB and the gunicorn master
+pay nothing, and every forked worker gets its own pool. Registration still
+resolves a mongodb+srv:// host (one DNS query); a mongodb:// seed list
+avoids even that.
+"""
+import logging
+import threading
+import time
+
+import mongoengine
+from pymongo import monitoring
+
+from employee_management import metrics
+from employee_management.timing import command_timing
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Counts pool events for this process (and feeds the pool metrics in metrics.py)
+
+    Checkout wait is measured from "checkout started" to "checked out" (or
+    failed); both events fire on the requesting thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.pools = 0
+            self.connections_open = 0
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checkout_timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def _finish_wait(self):
+        started = getattr(self._local, 'checkout_started', None)
+        self._local.checkout_started = None
+        wait = time.monotonic() - started if started is not None else 0.0
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        metrics.mongo_pool_wait.observe(wait)
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+            self.connections_created += 1
+        metrics.mongo_connections_open.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open -= 1
+            self.connections_closed += 1
+        metrics.mongo_connections_open.dec()
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.monotonic()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self.checkout_timeouts += 1
+            self._finish_wait()
+        metrics.mongo_pool_checkout_failures.labels(event.reason).inc()
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self._finish_wait()
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def stats(self):
+        """
+        Counters for /api/system/stats/
+        """
+        with self._lock:
+            return {
+                'pools': self.pools,
+                'connections_open': self.connections_open,
+                'connections_created': self.connections_created,
+                'connections_closed': self.connections_closed,
+                'checked_out': self.checked_out,
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'checkout_timeouts': self.checkout_timeouts,
+                'wait_ms_avg': round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else None,
+                'wait_ms_max': round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+pool_stats = PoolStatsListener()
+
+# Passed to every client (MongoEngine and motor)
+EVENT_LISTENERS = [pool_stats, command_timing, metrics.command_metrics]
+
+
+def register_connection(db, host, options):
+    """
+    Register the default MongoEngine connection without opening it
+    """
+    try:
+        mongoengine.register_connection(
+            alias=mongoengine.DEFAULT_CONNECTION_NAME,
+            db=db,
+            host=host,
+            connect=False,
+            event_listeners=EVENT_LISTENERS,
+            **options
+        )
+    except Exception as e:
+        # Keep settings importable (e.g. DNS unavailable); queries will fail until it is fixed
+        logger.warning('Could not register the MongoDB connection: %s', e)
+
+
+def warm_up():
+    """
+    Open the connection and one pooled socket now (gunicorn post_worker_init)
+    """
+    mongoengine.connection.get_db().command('ping')
@@ -0,0 +1,165 @@
+"""
+Per-request MongoDB instrumentation and Server-Timing headers
+
+A pymongo CommandListener adds every command's duration and shape to the
+timing of the request that issued it (tracked in a context variable, which
+sync_to_async and motor's executor both carry over). The middleware reports:
+
+    Server-Timing: db;dur=4.2;desc="3 commands", serialize;dur=11.8, total;dur=16.0
+
+db is time spent in MongoDB commands, serialize everything else (field
+selection, dict conversion, rendering) and total the whole request. Requests
+slower than SLOW_REQUEST_MS are logged with the shapes of their commands, so
+per-row lookups show up as one shape repeated many times.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+# Where a command keeps its filter: find/count/distinct, findAndModify, and the
+# first statement of an update/delete batch
+FILTER_KEYS = ('filter', 'query')
+STATEMENT_KEYS = ('updates', 'deletes')
+
+
+def value_shape(value):
+    """
+    Filter document with every value replaced by ?, keeping field names and operators
+    """
+    if isinstance(value, dict):
+        return '{' + ', '.join(f'{key}: {value_shape(item)}' for key, item in value.items()) + '}'
+    return '?'
+
+
+def command_shape(command_name, command):
+    """
+    Short, value-free description of a command, e.g. "find employees {_id: {$in: ?}}"
+    """
+    shape = f'{command_name} {command.get(command_name)}'
+    if command_name == 'aggregate':
+        stages = []
+        for stage in command.get('pipeline', []):
+            operator = next(iter(stage), '?')
+            stages.append(f'{operator} {value_shape(stage[operator])}' if operator == '$match' else operator)
+        return f"{shape} [{', '.join(stages)}]"
+    for key in FILTER_KEYS:
+        if isinstance(command.get(key), dict):
+            return f'{shape} {value_shape(command[key])}'
+    for key in STATEMENT_KEYS:
+        statements = command.get(key)
+        if statements:
+            return f"{shape} {value_shape(statements[0].get('q'))} x{len(statements)}"
+    return shape
+
+
+class RequestTiming:
+    """
+    MongoDB commands issued while serving one request
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.commands = 0
+        self.shapes = Counter()
+        self._lock = threading.Lock()
+
+    def command_started(self, event):
+        shape = command_shape(event.command_name, event.command)
+        with self._lock:
+            self.commands += 1
+            self.shapes[shape] += 1
+
+    def command_finished(self, event):
+        with self._lock:
+            self.db_seconds += event.duration_micros / 1e6
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """
+    Forwards command events to the current request's RequestTiming, if any
+    """
+
+    def started(self, event):
+        timing = _current.get()
+        if timing is not None:
+            timing.command_started(event)
+
+    def succeeded(self, event):
+        timing = _current.get()
+        if timing is not None:
+            timing.command_finished(event)
+
+    def failed(self, event):
+        timing = _current.get()
+        if timing is not None:
+            timing.command_finished(event)
+
+
+command_timing = CommandTimingListener()
+
+
+class ServerTimingMiddleware:
+    """
+    Adds Server-Timing (SERVER_TIMING) and logs slow requests (SLOW_REQUEST_MS)
+
+    Works under WSGI and ASGI. Streaming responses only include the time
+    spent before the first chunk.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing)
+
+    def finish(self, request, response, timing):
+        total_ms = (time.perf_counter() - timing.started) * 1000
+        db_ms = timing.db_seconds * 1000
+        serialize_ms = max(total_ms - db_ms, 0.0)
+
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{timing.commands} commands", '
+                f'serialize;dur={serialize_ms:.1f}, total;dur={total_ms:.1f}'
+            )
+
+        if settings.SLOW_REQUEST_MS is not None and total_ms >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                'Slow request %s %s -> %s: %.1fms (db %.1fms in %d commands, serialize %.1fms); %s',
+                request.method, request.get_full_path(), response.status_code,
+                total_ms, db_ms, timing.commands, serialize_ms,
+                '; '.join(f'{count}x {shape}' for shape, count in timing.shapes.most_common()) or 'no commands'
+            )
+        return response
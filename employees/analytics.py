@@ -0,0 +1,83 @@
+"""
+Department analytics: headcount and attendance per department over a date range
+
+One aggregation over employees joins each employee's attendance in the range
+with a $lookup and folds the results per department with a $group, so the
+per-employee work happens on the server and only one row per department is
+returned.
+"""
+from .attendance_models import Attendance, as_datetime
+from .models import Employee
+
+
+def _status_count(status):
+    return {'$sum': {'$cond': [{'$eq': ['$status', status]}, 1, 0]}}
+
+
+def department_pipeline(start, end):
+    """
+    Pipeline over employees: one {_id: department, headcount, reporting, present, absent} per department
+
+    The $lookup sub-pipeline matches one employee's records in the range
+    (served by the (employee, date) index) and reduces them to a single
+    records/present/absent document, so each joined array holds at most one element.
+    Empty and missing departments are both grouped under None.
+    """
+    return [
+        {'$project': {'department': 1}},
+        {'$lookup': {
+            'from': Attendance._meta['collection'],
+            'let': {'employee': '$_id'},
+            'pipeline': [
+                {'$match': {
+                    '$expr': {'$eq': ['$employee', '$$employee']},
+                    'date': {'$gte': as_datetime(start), '$lte': as_datetime(end)},
+                }},
+                {'$group': {
+                    '_id': None,
+                    'records': {'$sum': 1},
+                    'present': _status_count('Present'),
+                    'absent': _status_count('Absent'),
+                }},
+            ],
+            'as': 'attendance',
+        }},
+        {'$group': {
+            '_id': {'$cond': [{'$eq': [{'$ifNull': ['$department', '']}, '']}, None, '$department']},
+            'headcount': {'$sum': 1},
+            'reporting': {'$sum': {'$cond': [{'$gt': [{'$sum': '$attendance.records'}, 0]}, 1, 0]}},
+            'present': {'$sum': {'$sum': '$attendance.present'}},
+            'absent': {'$sum': {'$sum': '$attendance.absent'}},
+        }},
+        {'$sort': {'_id': 1}},
+    ]
+
+
+def attendance_rate(present, absent):
+    """Present records as a percentage of marked records, or None when nothing was marked"""
+    marked = present + absent
+    return round(present * 100 / marked, 2) if marked else None
+
+
+def department_statistics(start, end, read_preference=None):
+    """
+    Per-department headcount, employees with records (reporting), present/absent
+    counts and attendance rate for [start, end], plus totals over all departments
+
+    Runs with allowDiskUse so the $group can spill to disk on large ranges.
+    """
+    collection = Employee._get_collection()
+    if read_preference is not None:
+        collection = collection.with_options(read_preference=read_preference)
+
+    departments = []
+    totals = {'headcount': 0, 'reporting': 0, 'present': 0, 'absent': 0}
+    for group in collection.aggregate(department_pipeline(start, end), allowDiskUse=True):
+        row = {'department': group['_id']}
+        for field in totals:
+            row[field] = group[field]
+            totals[field] += group[field]
+        row['attendance_rate'] = attendance_rate(row['present'], row['absent'])
+        departments.append(row)
+    totals['attendance_rate'] = attendance_rate(totals['present'], totals['absent'])
+    return departments, totals
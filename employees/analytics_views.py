@@ -0,0 +1,152 @@
+"""
+Views for reporting across employees and attendance
+"""
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from .analytics import department_statistics
+from .attendance_patterns import employee_patterns
+from .read_preference import cache_window, read_preference
+from .serializers import employee_to_dict
+from .shared_cache import ATTENDANCE, EMPLOYEES, cache_response, cached_response
+
+
+def parse_date_range(request, default_days, max_days=None):
+    """
+    Resolve ?start_date=&end_date= (end defaults to today, start to default_days
+    before it) into ((start, end), None), or (None, error response)
+    """
+    start_date = request.query_params.get('start_date', None)
+    end_date = request.query_params.get('end_date', None)
+    try:
+        end = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else date.today()
+        if start_date:
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        else:
+            start = end - timedelta(days=default_days - 1)
+    except ValueError:
+        return None, Response({
+            'error': True,
+            'message': 'Invalid date format',
+            'details': 'Dates must be in YYYY-MM-DD format'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if start > end:
+        return None, Response({
+            'error': True,
+            'message': 'Invalid date range',
+            'details': 'start_date must not be after end_date'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if max_days and (end - start).days + 1 > max_days:
+        return None, Response({
+            'error': True,
+            'message': 'Invalid date range',
+            'details': f'The range can cover at most {max_days} days'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return (start, end), None
+
+
+@api_view(['GET'])
+def department_analytics(request):
+    """
+    Headcount, present/absent counts and attendance rate per department
+
+    GET /api/analytics/departments/ - The last ANALYTICS_DEFAULT_DAYS (30) days up to today
+    GET /api/analytics/departments/?start_date=2024-01-01&end_date=2024-03-31 - Another range
+    """
+    date_range, error = parse_date_range(request, settings.ANALYTICS_DEFAULT_DAYS)
+    if error:
+        return error
+    start, end = date_range
+
+    try:
+        # Keyed by the resolved range, so the default range is not reused after midnight;
+        # employee writes (department changes, deletes) invalidate it as well
+        canonical_url = f"{request.path}?{urlencode({'start_date': start, 'end_date': end})}"
+        cache_key, response = cached_response(
+            request, (ATTENDANCE, EMPLOYEES), cache_window('department_analytics'), url=canonical_url
+        )
+        if response is not None:
+            return response
+
+        departments, totals = department_statistics(start, end, read_preference('department_analytics'))
+        return cache_response(cache_key, {
+            'success': True,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'data': departments,
+            'totals': totals,
+            'count': len(departments)
+        })
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to compute department analytics',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def attendance_patterns(request):
+    """
+    Absence streaks, rolling attendance rates and frequent Monday absences per employee
+
+    GET /api/analytics/attendance-patterns/ - The last ATTENDANCE_PATTERN_DAYS (90) days, longest streaks first
+    GET /api/analytics/attendance-patterns/?start_date=2024-01-01&end_date=2024-06-30 - Another range (at most 366 days)
+    GET /api/analytics/attendance-patterns/?department=Sales&flagged=true - Frequent Monday absences in one department
+    GET /api/analytics/attendance-patterns/?limit=500 - More employees (default 100, at most 1000)
+    """
+    date_range, error = parse_date_range(
+        request, settings.ATTENDANCE_PATTERN_DAYS, settings.ATTENDANCE_PATTERN_MAX_DAYS
+    )
+    if error:
+        return error
+    start, end = date_range
+
+    try:
+        limit = int(request.query_params.get('limit', settings.API_PAGE_SIZE))
+        if not 1 <= limit <= settings.API_MAX_PAGE_SIZE:
+            raise ValueError
+    except ValueError:
+        return Response({
+            'error': True,
+            'message': 'Invalid limit parameter',
+            'details': f'limit must be an integer from 1 to {settings.API_MAX_PAGE_SIZE}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    department = request.query_params.get('department', None)
+    flagged_only = request.query_params.get('flagged', '').lower() in ('true', '1', 'yes')
+
+    try:
+        parameters = {'start_date': start, 'end_date': end, 'flagged': flagged_only, 'limit': limit}
+        if department is not None:
+            parameters['department'] = department
+        cache_key, response = cached_response(
+            request, (ATTENDANCE, EMPLOYEES), cache_window('attendance_patterns'),
+            url=f'{request.path}?{urlencode(parameters)}'
+        )
+        if response is not None:
+            return response
+
+        rows, total = employee_patterns(
+            start, end, department, flagged_only, limit, read_preference('attendance_patterns')
+        )
+        for row in rows:
+            row['employee'] = employee_to_dict(row['employee'])
+        return cache_response(cache_key, {
+            'success': True,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'data': rows,
+            'count': len(rows),
+            'total': total
+        })
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to compute attendance patterns',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
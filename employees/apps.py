@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
+
+    def ready(self):
+        from . import attendance_monthly, employee_cache, read_preference, shared_cache
+        employee_cache.connect_signals()
+        shared_cache.connect_signals()
+        read_preference.check_settings()
+        attendance_monthly.check_settings()
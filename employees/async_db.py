@@ -0,0 +1,39 @@
+"""
+Async MongoDB access (motor) for the async views
+"""
+import asyncio
+import weakref
+
+from django.conf import settings
+
+from employee_management.mongo import EVENT_LISTENERS
+
+_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncIOMotorClient
+
+
+def get_async_db():
+    """
+    Motor database handle for the running event loop
+
+    Motor clients are bound to the loop they were created on. uvicorn runs
+    one loop per worker, so each worker keeps a single client and pool.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # Imported lazily so sync (WSGI) deployments do not need motor installed
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = _clients[loop] = AsyncIOMotorClient(
+            settings.MONGODB_HOST,
+            event_listeners=EVENT_LISTENERS,
+            **settings.MONGODB_CLIENT_OPTIONS
+        )
+    return client[settings.MONGODB_NAME]
+
+
+def async_collection(document_class, read_preference=None):
+    """
+    Motor collection backing a MongoEngine document class, optionally with a read preference
+    """
+    collection = get_async_db()[document_class._get_collection_name()]
+    return collection.with_options(read_preference=read_preference) if read_preference else collection
@@ -0,0 +1,371 @@
+"""
+Async views for the read endpoints (enabled with ASYNC_VIEWS, served under ASGI)
+
+GET requests are answered with the async Mongo driver, so slow queries do
+not block the worker's event loop. Every other method is handed to the
+synchronous view in a worker thread.
+"""
+import functools
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from bson import ObjectId
+from bson.errors import InvalidId
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from . import attendance_monthly, attendance_views, views
+from .async_db import async_collection
+from .attendance_models import Attendance, MonthlyAttendance, as_datetime
+from .attendance_serializers import attendance_days_to_dicts, attendance_list_to_dicts
+from .attendance_views import STATUS_COUNT_PIPELINE, statistics_from_groups
+from .employee_cache import employee_cache
+from .field_selection import (
+    ATTENDANCE_OUTPUT_FIELDS,
+    EMPLOYEE_OUTPUT_FIELDS,
+    FieldSelectionError,
+    database_fields,
+    nested_selection,
+    parse_fields,
+    select_fields,
+)
+from .models import Employee
+from .pagination import (
+    ATTENDANCE_ORDERING,
+    EMPLOYEE_ORDERING,
+    PaginationError,
+    page_metadata,
+    paginate_collection,
+)
+from .read_preference import cache_window, read_preference
+from .serializers import employee_to_dict
+from .shared_cache import ATTENDANCE, EMPLOYEES, alookup_response, astore_response, employee_scope, response_headers
+
+
+def async_read_view(sync_view):
+    """
+    Serve GET with the decorated coroutine and every other method with sync_view
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method == 'GET':
+                # DRF's Request gives the shared helpers request.query_params
+                return await view(Request(request), *args, **kwargs)
+            return await sync_to_async(sync_view, thread_sensitive=False)(request, *args, **kwargs)
+        # Same as DRF's @api_view: the API does not use session authentication
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+def render(data, status_code, headers=None):
+    """
+    JSON response rendered exactly like the DRF views
+    """
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type='application/json',
+        headers=headers
+    )
+
+
+def render_cached(cache_key, data):
+    """
+    A 200 with data, or a 304 when data is None, carrying the ETag for cache_key
+    """
+    if data is None:
+        return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=response_headers(cache_key))
+    return render(data, status.HTTP_200_OK, response_headers(cache_key))
+
+
+def projection(fields):
+    """
+    find() projection for MongoEngine field names (as returned by database_fields)
+    """
+    return {('_id' if field == 'id' else field): 1 for field in fields}
+
+
+def parse_date(value):
+    """
+    Parse a YYYY-MM-DD query parameter into the midnight datetime DateField stores
+    """
+    return as_datetime(datetime.strptime(value, '%Y-%m-%d'))
+
+
+@async_read_view(views.employee_list_create)
+async def employee_list_create(request):
+    """
+    GET /api/employees/ - async version of views.employee_list_create
+    """
+    try:
+        try:
+            selection = parse_fields(request, EMPLOYEE_OUTPUT_FIELDS)
+        except FieldSelectionError as e:
+            return render({
+                'error': True,
+                'message': 'Invalid fields parameter',
+                'details': str(e)
+            }, status.HTTP_400_BAD_REQUEST)
+
+        cache_key, not_modified, response_data = await alookup_response(
+            request, (EMPLOYEES,), cache_window('employee_list')
+        )
+        if not_modified or response_data is not None:
+            return render_cached(cache_key, response_data)
+
+        fields = projection(database_fields(selection, EMPLOYEE_OUTPUT_FIELDS))
+        try:
+            page, next_cursor = await paginate_collection(
+                async_collection(Employee, read_preference('employee_list')), {}, fields, request, EMPLOYEE_ORDERING
+            )
+        except PaginationError as e:
+            return render({
+                'error': True,
+                'message': 'Invalid pagination parameters',
+                'details': str(e)
+            }, status.HTTP_400_BAD_REQUEST)
+
+        data = [select_fields(employee_to_dict(son), selection) for son in page]
+        response_data = {
+            'success': True,
+            'data': data,
+            **page_metadata(request, data, next_cursor)
+        }
+        await astore_response(cache_key, response_data)
+        return render_cached(cache_key, response_data)
+    except Exception as e:
+        return render({
+            'error': True,
+            'message': 'Failed to retrieve employees',
+            'details': str(e)
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_read_view(views.employee_detail)
+async def employee_detail(request, employee_id):
+    """
+    GET /api/employees/<id>/ - async version of views.employee_detail
+    """
+    try:
+        selection = parse_fields(request, EMPLOYEE_OUTPUT_FIELDS)
+    except FieldSelectionError as e:
+        return render({
+            'error': True,
+            'message': 'Invalid fields parameter',
+            'details': str(e)
+        }, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        object_id = ObjectId(employee_id)
+        cache_key, not_modified, response_data = await alookup_response(request, (employee_scope(object_id),))
+        if not_modified or response_data is not None:
+            return render_cached(cache_key, response_data)
+
+        # Same as the sync view: full reads go through the employee cache,
+        # ?fields= reads fetch only the selected fields
+        if selection is None:
+            employee = await employee_cache.aget_by_id(object_id)
+        else:
+            employee = await async_collection(Employee).find_one(
+                {'_id': object_id}, projection(database_fields(selection, EMPLOYEE_OUTPUT_FIELDS))
+            )
+        if not employee:
+            return render({
+                'error': True,
+                'message': 'Employee not found',
+                'details': f'No employee found with id: {employee_id}'
+            }, status.HTTP_404_NOT_FOUND)
+
+        response_data = {
+            'success': True,
+            'data': select_fields(employee_to_dict(employee), selection)
+        }
+        await astore_response(cache_key, response_data)
+        return render_cached(cache_key, response_data)
+    except (InvalidId, TypeError) as e:
+        return render({
+            'error': True,
+            'message': 'Invalid employee ID',
+            'details': str(e)
+        }, status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return render({
+            'error': True,
+            'message': 'Failed to retrieve employee',
+            'details': str(e)
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_read_view(attendance_views.attendance_list_create)
+async def attendance_list_create(request):
+    """
+    GET /api/attendance/ - async version of attendance_views.attendance_list_create
+    """
+    try:
+        try:
+            selection = parse_fields(request, ATTENDANCE_OUTPUT_FIELDS, nested={'employee': EMPLOYEE_OUTPUT_FIELDS})
+        except FieldSelectionError as e:
+            return render({
+                'error': True,
+                'message': 'Invalid fields parameter',
+                'details': str(e)
+            }, status.HTTP_400_BAD_REQUEST)
+
+        cache_key, not_modified, response_data = await alookup_response(
+            request, (ATTENDANCE, EMPLOYEES), cache_window('attendance_list')
+        )
+        if not_modified or response_data is not None:
+            return render_cached(cache_key, response_data)
+
+        query = {}
+        employee_id = request.query_params.get('employeeId', None)
+        if employee_id:
+            employee = await employee_cache.aget_by_employee_id(employee_id)
+            if not employee:
+                return render({
+                    'error': True,
+                    'message': 'Employee not found',
+                    'details': f'No employee found with ID: {employee_id}'
+                }, status.HTTP_404_NOT_FOUND)
+            query['employee'] = employee['_id']
+
+        attendance_date = request.query_params.get('date', None)
+        if attendance_date:
+            try:
+                query['date'] = parse_date(attendance_date)
+            except ValueError:
+                return render({
+                    'error': True,
+                    'message': 'Invalid date format',
+                    'details': 'Date must be in YYYY-MM-DD format'
+                }, status.HTTP_400_BAD_REQUEST)
+
+        # The sort keys are always read because the next-page cursor is built from them
+        fields = projection(set(database_fields(selection, ATTENDANCE_OUTPUT_FIELDS)) | {'date', 'created_at'})
+        try:
+            page, next_cursor = await paginate_collection(
+                async_collection(Attendance, read_preference('attendance_list')), query, fields, request, ATTENDANCE_ORDERING
+            )
+        except PaginationError as e:
+            return render({
+                'error': True,
+                'message': 'Invalid pagination parameters',
+                'details': str(e)
+            }, status.HTTP_400_BAD_REQUEST)
+
+        employees = {}
+        if nested_selection(selection, 'employee') is not False:
+            employee_ids = {son.get('employee') for son in page} - {None}
+            employees = await employee_cache.aget_many_by_id(employee_ids) if employee_ids else {}
+
+        data = attendance_list_to_dicts(page, employees, selection)
+        response_data = {
+            'success': True,
+            'data': data,
+            **page_metadata(request, data, next_cursor)
+        }
+        await astore_response(cache_key, response_data)
+        return render_cached(cache_key, response_data)
+    except Exception as e:
+        return render({
+            'error': True,
+            'message': 'Failed to retrieve attendance records',
+            'details': str(e)
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@async_read_view(attendance_views.employee_attendance)
+async def employee_attendance(request, employee_id):
+    """
+    GET /api/employees/<employeeId>/attendance/ - async version of attendance_views.employee_attendance
+    """
+    try:
+        selection = parse_fields(request, ATTENDANCE_OUTPUT_FIELDS, nested={'employee': EMPLOYEE_OUTPUT_FIELDS})
+    except FieldSelectionError as e:
+        return render({
+            'error': True,
+            'message': 'Invalid fields parameter',
+            'details': str(e)
+        }, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        employee = await employee_cache.aget_by_employee_id(employee_id)
+        if not employee:
+            return render({
+                'error': True,
+                'message': 'Employee not found',
+                'details': f'No employee found with ID: {employee_id}'
+            }, status.HTTP_404_NOT_FOUND)
+
+        cache_key, not_modified, response_data = await alookup_response(
+            request, (employee_scope(employee['_id']),), cache_window('employee_attendance')
+        )
+        if not_modified or response_data is not None:
+            return render_cached(cache_key, response_data)
+
+        query = {'employee': employee['_id']}
+        for param, operator in (('start_date', '$gte'), ('end_date', '$lte')):
+            value = request.query_params.get(param, None)
+            if value:
+                try:
+                    query.setdefault('date', {})[operator] = parse_date(value)
+                except ValueError:
+                    return render({
+                        'error': True,
+                        'message': f'Invalid {param} format',
+                        'details': 'Date must be in YYYY-MM-DD format'
+                    }, status.HTTP_400_BAD_REQUEST)
+
+        summary_only = request.query_params.get('summary_only', '').lower() in ('true', '1', 'yes')
+
+        collection = async_collection(Attendance, read_preference('employee_attendance'))
+        marked_days = None
+        if attendance_monthly.enabled() and (summary_only or attendance_monthly.covers(selection)):
+            start, end = (query.get('date', {}).get(operator) for operator in ('$gte', '$lte'))
+            start, end = start and start.date(), end and end.date()
+            months = async_collection(MonthlyAttendance, read_preference('employee_attendance')).find(
+                attendance_monthly.month_query(employee['_id'], start, end), attendance_monthly.MONTH_PROJECTION
+            ).sort('month', -1)
+            marked_days = list(attendance_monthly.marked_days(await months.to_list(None), start, end))
+            statistics = attendance_monthly.statistics(marked_days)
+        else:
+            groups = await collection.aggregate([{'$match': query}, *STATUS_COUNT_PIPELINE]).to_list(None)
+            statistics = statistics_from_groups(groups)
+        employee_data = employee_to_dict(employee)
+
+        if summary_only:
+            response_data = {
+                'success': True,
+                'employee': employee_data,
+                'statistics': statistics
+            }
+            await astore_response(cache_key, response_data)
+            return render_cached(cache_key, response_data)
+
+        if marked_days is not None:
+            data = attendance_days_to_dicts(marked_days, employee, selection)
+        else:
+            fields = projection(database_fields(selection, ATTENDANCE_OUTPUT_FIELDS))
+            cursor = collection.find(query, fields).sort([('date', -1), ('created_at', -1)])
+            records = await cursor.to_list(None)
+            data = attendance_list_to_dicts(records, {employee['_id']: employee}, selection)
+
+        response_data = {
+            'success': True,
+            'employee': employee_data,
+            'data': data,
+            'count': len(data),
+            'statistics': statistics
+        }
+        await astore_response(cache_key, response_data)
+        return render_cached(cache_key, response_data)
+    except Exception as e:
+        return render({
+            'error': True,
+            'message': 'Failed to retrieve employee attendance',
+            'details': str(e)
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,114 @@
+"""
+Bulk attendance marking
+"""
+from datetime import datetime
+
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from rest_framework import serializers
+
+from . import attendance_monthly
+from .attendance_models import Attendance, as_datetime
+from .attendance_serializers import AttendanceMarkSerializer
+from .attendance_summary import apply_changes
+from .employee_cache import employee_cache
+from .shared_cache import ATTENDANCE, bump_version, employee_scope
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def mark_attendance_bulk(items):
+    """
+    Validate and insert a list of {employeeId, date, status} items
+
+    Uses at most one $in query to resolve employees, one query to find existing
+    records, a single unordered bulk_write and one summary bulk_write. Returns
+    one result per item, in request order.
+    """
+    results = [None] * len(items)
+    valid_items = []
+
+    # Field validation only; no database access per item
+    item_serializer = AttendanceMarkSerializer()
+    for index, item in enumerate(items):
+        try:
+            valid_items.append((index, item_serializer.run_validation(item)))
+        except serializers.ValidationError as e:
+            results[index] = {'index': index, 'result': 'invalid', 'errors': e.detail}
+
+    # Resolve every employeeId from the cache, with a single $in query for misses
+    employee_ids = {data['employeeId'] for _, data in valid_items}
+    employee_records = employee_cache.get_many_by_employee_id(employee_ids) if employee_ids else {}
+    employee_map = {employee_id: record['_id'] for employee_id, record in employee_records.items()}
+    departments = {record['_id']: record.get('department') for record in employee_records.values()}
+
+    # Find already-marked (employee, date) pairs with a single query
+    candidate_employees = {employee_map[data['employeeId']] for _, data in valid_items if data['employeeId'] in employee_map}
+    candidate_dates = {as_datetime(data['date']) for _, data in valid_items}
+    existing = set()
+    if candidate_employees:
+        existing = {
+            (row['employee'], row['date'])
+            for row in Attendance.objects(__raw__={
+                'employee': {'$in': list(candidate_employees)},
+                'date': {'$in': list(candidate_dates)},
+            }).only('employee', 'date').as_pymongo()
+        }
+
+    operations = []
+    operation_items = []
+    created_at = datetime.utcnow()
+    for index, data in valid_items:
+        employee_id = data['employeeId']
+        result = {'index': index, 'employeeId': employee_id, 'date': data['date'].isoformat()}
+        results[index] = result
+
+        if employee_id not in employee_map:
+            result.update(result='invalid', errors={'employeeId': [f"Employee with ID '{employee_id}' not found"]})
+            continue
+
+        key = (employee_map[employee_id], as_datetime(data['date']))
+        if key in existing:
+            # Already stored, or repeated earlier in this request
+            result.update(result='duplicate', errors={'date': [f"Attendance for this employee on {data['date']} already exists."]})
+            continue
+        existing.add(key)
+
+        document = {'employee': key[0], 'date': key[1], 'status': data['status'], 'created_at': created_at}
+        operations.append(InsertOne(document))
+        operation_items.append((result, document))
+
+    write_errors = {}
+    if operations:
+        try:
+            Attendance._get_collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            write_errors = {error['index']: error for error in e.details.get('writeErrors', [])}
+        # Raw bulk writes skip document signals, so invalidate cached reads here
+        bump_version(ATTENDANCE, *{employee_scope(document['employee']) for _, document in operation_items})
+
+    summary_changes, monthly_changes = [], []
+    for position, (result, document) in enumerate(operation_items):
+        error = write_errors.get(position)
+        if error is None:
+            result.update(result='created', id=str(document['_id']))
+            summary_changes.append((document['date'], departments[document['employee']], document['status'], 1))
+            monthly_changes.append((document['employee'], document['date'], document['status']))
+        elif error.get('code') == DUPLICATE_KEY_ERROR:
+            result.update(result='duplicate', errors={'date': [f"Attendance for this employee on {result['date']} already exists."]})
+        else:
+            result.update(result='failed', errors={'non_field_errors': [error.get('errmsg', 'Write failed')]})
+    apply_changes(summary_changes)
+    attendance_monthly.apply_changes(monthly_changes)
+
+    return results
+
+
+def summarize_results(results):
+    """
+    Count bulk results by outcome
+    """
+    summary = {'created': 0, 'duplicate': 0, 'invalid': 0, 'failed': 0}
+    for result in results:
+        summary[result['result']] += 1
+    return summary
@@ -0,0 +1,94 @@
+"""
+Streaming export of attendance records as CSV or NDJSON
+"""
+import csv
+import io
+import json
+
+from django.conf import settings
+
+from .attendance_models import Attendance
+from .attendance_serializers import ATTENDANCE_FIELDS, attendance_to_dict
+from .employee_cache import employee_cache
+from .read_preference import read_preference
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+CSV_COLUMNS = ['id', 'date', 'status', 'created_at', 'employeeId', 'full_name', 'email', 'department']
+
+
+def _csv_lines(records):
+    """Render records as CSV rows (employee fields flattened)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        employee = record['employee'] or {}
+        writer.writerow([
+            record['id'], record['date'], record['status'], record['created_at'],
+            employee.get('employeeId', ''), employee.get('full_name', ''),
+            employee.get('email', ''), employee.get('department', ''),
+        ])
+    return buffer.getvalue()
+
+
+def _ndjson_lines(records):
+    """Render records as one JSON object per line"""
+    return ''.join(json.dumps(record) + '\n' for record in records)
+
+
+def iter_attendance_batches(attendance_records, batch_size):
+    """
+    Yield lists of raw attendance documents with their employees joined
+
+    Reads through a server-side cursor without caching results, and resolves
+    the employees referenced by each batch through the employee cache (one $in
+    query for misses); employees already seen are kept in a local map.
+    """
+    employees = {}
+    cursor = attendance_records.only(*ATTENDANCE_FIELDS).no_cache().as_pymongo().batch_size(batch_size)
+    batch = []
+    for son in cursor:
+        batch.append(son)
+        if len(batch) >= batch_size:
+            yield _join_employees(batch, employees)
+            batch = []
+    if batch:
+        yield _join_employees(batch, employees)
+
+
+def _join_employees(batch, employees):
+    """Attach employees to a batch, fetching the ones not seen yet"""
+    missing = {son.get('employee') for son in batch} - employees.keys()
+    missing.discard(None)
+    if missing:
+        employees.update(employee_cache.get_many_by_id(missing))
+    return [attendance_to_dict(son, employees.get(son.get('employee'))) for son in batch]
+
+
+def stream_attendance_export(attendance_records, export_format):
+    """
+    Generate the export body chunk by chunk (one chunk per cursor batch)
+    """
+    batch_size = settings.ATTENDANCE_EXPORT_BATCH_SIZE
+    if export_format == 'csv':
+        yield ','.join(CSV_COLUMNS) + '\r\n'
+        render = _csv_lines
+    else:
+        render = _ndjson_lines
+
+    for records in iter_attendance_batches(attendance_records, batch_size):
+        yield render(records)
+
+
+def export_queryset(start_date=None, end_date=None):
+    """
+    Attendance in a date range, oldest first (served by the date index)
+    """
+    attendance_records = Attendance.objects.read_preference(read_preference('attendance_export'))
+    if start_date:
+        attendance_records = attendance_records.filter(date__gte=start_date)
+    if end_date:
+        attendance_records = attendance_records.filter(date__lte=end_date)
+    return attendance_records.order_by('date')
@@ -1,10 +1,17 @@
 """
 Attendance Model using MongoEngine
 """
-from mongoengine import Document, StringField, ReferenceField, DateField, DateTimeField
+from mongoengine import Document, StringField, ReferenceField, DateField, DateTimeField, IntField
 from datetime import datetime, date
 
 
+def as_datetime(value):
+    """
+    The midnight datetime MongoEngine stores for a DateField value, for raw queries and writes
+    """
+    return datetime(value.year, value.month, value.day)
+
+
 class Attendance(Document):
     """
     Attendance Model with MongoDB
@@ -18,7 +25,9 @@ class Attendance(Document):
     meta = {
         'collection': 'attendance',
         'indexes': [
-            ('employee', 'date'),  # Composite index for faster lookups
+            # One record per employee per day; also serves employee + date range lookups
+            {'fields': ('employee', 'date'), 'unique': True},
+            ('-date', '-created_at', '-id'),  # Matches the paginated list ordering
             'date',
             'employee'
         ],
@@ -41,3 +50,47 @@ class Attendance(Document):
     
     def __str__(self):
         return f"{self.employee.full_name} - {self.date} - {self.status}"
+
+
+class DailyAttendanceSummary(Document):
+    """
+    Present/absent counts per day per department
+    Kept current with $inc at every attendance write (attendance_summary.py);
+    rebuilt from the attendance collection with manage.py rebuild_attendance_summary
+    """
+    date = DateField(required=True)
+    department = StringField(null=True)  # None for employees without a department
+    present = IntField(default=0)
+    absent = IntField(default=0)
+    
+    meta = {
+        'collection': 'daily_attendance_summary',
+        'indexes': [
+            {'fields': ('date', 'department'), 'unique': True},
+        ],
+    }
+    
+    def __str__(self):
+        return f"{self.date} - {self.department} - {self.present} present / {self.absent} absent"
+
+
+class MonthlyAttendance(Document):
+    """
+    One employee's attendance for one month as day bitmasks (bit 0 is the 1st)
+    Kept alongside Attendance when ATTENDANCE_STORAGE_MODE is 'dual' (attendance_monthly.py);
+    rebuilt from the attendance collection with manage.py rebuild_attendance_monthly
+    """
+    employee = ReferenceField('Employee', required=True)
+    month = DateField(required=True)  # First day of the month
+    present = IntField(default=0)
+    absent = IntField(default=0)
+    
+    meta = {
+        'collection': 'attendance_monthly',
+        'indexes': [
+            {'fields': ('employee', 'month'), 'unique': True},
+        ],
+    }
+    
+    def __str__(self):
+        return f"{self.employee} - {self.month:%Y-%m}"
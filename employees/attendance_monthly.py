@@ -0,0 +1,192 @@
+"""
+Compact attendance: one document per (employee, month) with present/absent day bitmasks
+
+In 'dual' storage mode (settings.ATTENDANCE_STORAGE_MODE) every write path that
+creates, changes or deletes attendance also updates these documents with $bit,
+so a year of one employee's attendance is 12 small documents instead of ~250
+rows. The attendance rows stay the source of truth: record ids, created_at and
+the other endpoints use them, and rebuild() recomputes the bitmasks from them.
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from pymongo import UpdateOne
+
+from .attendance_models import Attendance, MonthlyAttendance
+
+ROWS = 'rows'
+DUAL = 'dual'
+STORAGE_MODES = (ROWS, DUAL)
+
+STATUS_FIELDS = {'Present': 'present', 'Absent': 'absent'}
+
+# Record fields that can be built from a month document
+RECORD_FIELDS = ('employee', 'date', 'status')
+
+MONTH_PROJECTION = {'_id': 0, 'month': 1, 'present': 1, 'absent': 1}
+
+
+def enabled():
+    return settings.ATTENDANCE_STORAGE_MODE == DUAL
+
+
+def check_settings():
+    """
+    Fail at startup, not on the first write, on an unknown storage mode
+    """
+    if settings.ATTENDANCE_STORAGE_MODE not in STORAGE_MODES:
+        raise ImproperlyConfigured(
+            f'Invalid ATTENDANCE_STORAGE_MODE {settings.ATTENDANCE_STORAGE_MODE!r}; '
+            f"choose from: {', '.join(STORAGE_MODES)}"
+        )
+
+
+def month_start(day):
+    """Months are stored as midnight datetimes of their first day"""
+    return datetime(day.year, day.month, 1)
+
+
+def day_bit(day):
+    return 1 << (day.day - 1)
+
+
+def _update(key, and_masks, or_masks):
+    operators = {field: {'and': ~mask} for field, mask in and_masks.items() if mask}
+    operators.update((field, {'or': mask}) for field, mask in or_masks.items() if mask)
+    return UpdateOne(key, {'$bit': operators}, upsert=True)
+
+
+def apply_changes(changes):
+    """
+    Apply (employee ObjectId, date, status) changes with one ordered bulk_write;
+    a status of None clears the day. Does nothing unless storage mode is 'dual'.
+
+    Later changes to the same day win. Setting a day ORs its bit into one mask
+    and ANDs it out of the other, so a single-day change is one atomic update.
+    $bit takes one operator per field, so a month whose batch both sets and
+    clears bits in the same mask gets a clearing update followed by a setting one.
+    """
+    if not enabled():
+        return
+    months = defaultdict(dict)  # (employee, month) -> {day bit: status}
+    for employee_id, day, status in changes:
+        if employee_id is not None:
+            months[(employee_id, month_start(day))][day_bit(day)] = status
+
+    operations = []
+    for (employee_id, month), days in months.items():
+        key = {'employee': employee_id, 'month': month}
+        and_masks, or_masks = Counter(), Counter()
+        for bit, status in days.items():
+            for field in STATUS_FIELDS.values():
+                if STATUS_FIELDS.get(status) == field:
+                    or_masks[field] |= bit
+                else:
+                    and_masks[field] |= bit
+        if any(and_masks[field] and or_masks[field] for field in STATUS_FIELDS.values()):
+            operations.append(_update(key, and_masks, {}))
+            operations.append(_update(key, {}, or_masks))
+        else:
+            operations.append(_update(key, and_masks, or_masks))
+    if operations:
+        MonthlyAttendance._get_collection().bulk_write(operations)
+
+
+def record_set(employee_id, day, status):
+    apply_changes([(employee_id, day, status)])
+
+
+def record_cleared(employee_id, day):
+    apply_changes([(employee_id, day, None)])
+
+
+def record_changed(old, new):
+    """
+    old and new are (employee ObjectId, date, status); nothing is written if they match
+    """
+    if old == new:
+        return
+    changes = [] if old[:2] == new[:2] else [(*old[:2], None)]
+    apply_changes(changes + [new])
+
+
+def month_query(employee_id, start=None, end=None):
+    """
+    Query for one employee's month documents overlapping [start, end] (dates; None for unbounded)
+    """
+    query = {'employee': employee_id}
+    if start:
+        query.setdefault('month', {})['$gte'] = month_start(start)
+    if end:
+        query.setdefault('month', {})['$lte'] = month_start(end)
+    return query
+
+
+def month_documents(employee_id, start=None, end=None, read_preference=None):
+    """
+    One employee's month documents for [start, end], newest first, from the (employee, month) index
+    """
+    collection = MonthlyAttendance._get_collection()
+    if read_preference is not None:
+        collection = collection.with_options(read_preference=read_preference)
+    return collection.find(month_query(employee_id, start, end), MONTH_PROJECTION).sort('month', -1)
+
+
+def marked_days(documents, start=None, end=None):
+    """
+    (date, status) of every marked day in month documents sorted newest first,
+    newest day first, limited to [start, end]
+    """
+    for document in documents:
+        month = document['month']
+        present, absent = document.get('present', 0), document.get('absent', 0)
+        for day_number in range(31, 0, -1):
+            bit = 1 << (day_number - 1)
+            if not (present | absent) & bit:
+                continue
+            day = date(month.year, month.month, day_number)
+            if (start and day < start) or (end and day > end):
+                continue
+            yield day, 'Present' if present & bit else 'Absent'
+
+
+def statistics(days):
+    """
+    The statistics block of employee attendance responses, from marked_days() output
+    """
+    counts = Counter(status for _, status in days)
+    return {'total': sum(counts.values()), 'present': counts['Present'], 'absent': counts['Absent']}
+
+
+def covers(selection):
+    """
+    True when a ?fields= selection only asks for record fields month documents can provide
+    """
+    return selection is not None and set(selection) <= set(RECORD_FIELDS)
+
+
+def rebuild(employee_ids=None):
+    """
+    Recompute month documents (all, or for the given employee ObjectIds) from attendance
+
+    Writes that land while it runs can be lost, so run it when attendance is
+    quiet. Returns the number of month documents written.
+    """
+    query = {'employee': {'$in': list(employee_ids)}} if employee_ids is not None else {}
+    masks = defaultdict(Counter)
+    for row in Attendance._get_collection().find(query, {'_id': 0, 'employee': 1, 'date': 1, 'status': 1}):
+        field = STATUS_FIELDS.get(row.get('status'))
+        if field:
+            masks[(row['employee'], month_start(row['date']))][field] |= day_bit(row['date'])
+
+    collection = MonthlyAttendance._get_collection()
+    collection.delete_many(query)
+    documents = [
+        {'employee': employee_id, 'month': month, 'present': bits['present'], 'absent': bits['absent']}
+        for (employee_id, month), bits in masks.items()
+    ]
+    if documents:
+        collection.insert_many(documents, ordered=False)
+    return len(documents)
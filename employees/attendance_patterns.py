@@ -0,0 +1,243 @@
+"""
+Attendance patterns per employee, computed on a dense employees x days matrix with NumPy
+
+Attendance for the range is loaded into an int8 matrix (UNMARKED, PRESENT,
+ABSENT), from the month bitmasks when ATTENDANCE_STORAGE_MODE is 'dual' and
+from the attendance rows otherwise. Every metric is then a handful of array
+operations over the whole roster instead of a Python loop per employee.
+"""
+from calendar import monthrange
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from . import attendance_monthly
+from .attendance_models import Attendance, MonthlyAttendance, as_datetime
+from .models import Employee
+
+UNMARKED, PRESENT, ABSENT = 0, 1, 2
+STATUS_CODES = {'Present': PRESENT, 'Absent': ABSENT}
+
+MONDAY = 0
+DAY_BITS = np.left_shift(1, np.arange(31, dtype=np.int64))
+# log(n!) for every count a range of at most 366 days can produce
+LOG_FACTORIALS = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, 367)))])
+
+
+def matrix_from_rows(rows, index, start, days):
+    """
+    Matrix from raw attendance rows ({employee, date, status}); rows of employees not in index are skipped
+    """
+    codes = np.zeros((len(index), days), dtype=np.int8)
+    origin = as_datetime(start)
+    positions, columns, values = [], [], []
+    for row in rows:
+        position = index.get(row['employee'])
+        if position is not None:
+            positions.append(position)
+            columns.append((row['date'] - origin).days)
+            values.append(STATUS_CODES.get(row['status'], UNMARKED))
+    columns = np.asarray(columns, dtype=np.int64)
+    inside = (columns >= 0) & (columns < days)
+    codes[np.asarray(positions, dtype=np.int64)[inside], columns[inside]] = np.asarray(values, dtype=np.int8)[inside]
+    return codes
+
+
+def matrix_from_months(documents, index, start, days):
+    """
+    Matrix from month documents ({employee, month, present, absent})
+
+    Documents are grouped by month; each month's masks are expanded to the
+    month's day columns at once and written as one block of columns. Blocks
+    stop at the month's last day, so document order does not matter.
+    """
+    codes = np.zeros((len(index), days), dtype=np.int8)
+    months = defaultdict(lambda: ([], [], []))  # month -> (positions, present masks, absent masks)
+    for document in documents:
+        position = index.get(document['employee'])
+        if position is not None:
+            positions, present, absent = months[document['month']]
+            positions.append(position)
+            present.append(document.get('present', 0))
+            absent.append(document.get('absent', 0))
+
+    origin = as_datetime(start)
+    for month, (positions, present, absent) in months.items():
+        offset = (month - origin).days
+        first, last = max(0, -offset), min(monthrange(month.year, month.month)[1], days - offset)
+        if first >= last:
+            continue
+        present = (np.array(present, dtype=np.int64)[:, None] & DAY_BITS[first:last]) != 0
+        absent = (np.array(absent, dtype=np.int64)[:, None] & DAY_BITS[first:last]) != 0
+        codes[np.array(positions), offset + first:offset + last] = np.where(
+            present, PRESENT, np.where(absent, ABSENT, UNMARKED)
+        )
+    return codes
+
+
+def load_matrix(employee_ids, start, end, read_preference=None, whole_roster=False):
+    """
+    employees x days status matrix for [start, end]; row i is employee_ids[i]
+
+    whole_roster skips the $in filter on employee when employee_ids is every employee.
+    """
+    index = {employee_id: position for position, employee_id in enumerate(employee_ids)}
+    days = (end - start).days + 1
+    query = {} if whole_roster else {'employee': {'$in': list(employee_ids)}}
+
+    if attendance_monthly.enabled():
+        collection = MonthlyAttendance._get_collection()
+        query['month'] = {'$gte': attendance_monthly.month_start(start), '$lte': attendance_monthly.month_start(end)}
+        projection = {'_id': 0, 'employee': 1, 'month': 1, 'present': 1, 'absent': 1}
+        build = matrix_from_months
+    else:
+        collection = Attendance._get_collection()
+        query['date'] = {'$gte': as_datetime(start), '$lte': as_datetime(end)}
+        projection = {'_id': 0, 'employee': 1, 'date': 1, 'status': 1}
+        build = matrix_from_rows
+    if read_preference is not None:
+        collection = collection.with_options(read_preference=read_preference)
+    cursor = collection.find(query, projection).batch_size(settings.ATTENDANCE_EXPORT_BATCH_SIZE)
+    return build(cursor, index, start, days)
+
+
+def _rate(numerator, denominator):
+    """Percentage per element (float32), NaN where the denominator is 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator * np.float32(100) / denominator, np.float32(np.nan))
+
+
+def _running_total(matrix):
+    """Per-row running totals with a leading zero column (int16: ranges are at most 366 days)"""
+    totals = np.zeros((matrix.shape[0], matrix.shape[1] + 1), dtype=np.int16)
+    np.cumsum(matrix, axis=1, dtype=np.int16, out=totals[:, 1:])
+    return totals
+
+
+def binomial_tail(successes, trials, probability):
+    """
+    P(X >= successes) for X ~ Binomial(trials, probability), per element
+
+    Sums the pmf over every possible count up to the largest number of trials.
+    """
+    counts = np.arange(int(trials.max(initial=0)) + 1)
+    trials, successes = trials[:, None], successes[:, None]
+    probability = np.clip(probability, 1e-12, 1 - 1e-12)[:, None]
+    log_pmf = (
+        LOG_FACTORIALS[trials] - LOG_FACTORIALS[counts] - LOG_FACTORIALS[np.maximum(trials - counts, 0)]
+        + counts * np.log(probability) + (trials - counts) * np.log1p(-probability)
+    )
+    return np.where((counts >= successes) & (counts <= trials), np.exp(log_pmf), 0.0).sum(axis=1)
+
+
+def compute(codes, start):
+    """
+    Per-employee metrics for a status matrix whose first column is `start`
+
+    - longest_absence_streak: most consecutive absent records; unmarked days
+      (weekends, holidays) neither extend nor break a streak
+    - rolling_rate: attendance rate over the last ATTENDANCE_PATTERN_WINDOW_DAYS
+      of the range; lowest_rolling_rate: lowest such window anywhere in the range
+    - frequent_monday_absences: at least ATTENDANCE_PATTERN_MONDAY_MIN_ABSENCES
+      Monday absences, and that many would happen by chance less than
+      ATTENDANCE_PATTERN_MONDAY_SIGNIFICANCE of the time if Mondays had the
+      employee's absence rate on other days (one-sided binomial test); needs
+      at least ATTENDANCE_PATTERN_MONDAY_MIN_OTHER_DAYS marked non-Mondays,
+      since without them there is no rate to compare against
+
+    Returns a dict of arrays (rates in percent, NaN when nothing was marked).
+    """
+    present = codes == PRESENT
+    absent = codes == ABSENT
+    days = codes.shape[1]
+
+    # Absences so far, minus the count at the latest present record, is the current streak
+    absent_so_far = _running_total(absent)
+    absences_so_far = absent_so_far[:, 1:]
+    at_last_present = np.maximum.accumulate(np.where(present, absences_so_far, 0), axis=1)
+    longest_streak = (absences_so_far - at_last_present).max(axis=1)
+
+    window = min(settings.ATTENDANCE_PATTERN_WINDOW_DAYS, days)
+    present_so_far = _running_total(present)
+    marked_so_far = present_so_far + absent_so_far
+    window_rates = _rate(
+        present_so_far[:, window:] - present_so_far[:, :-window],
+        marked_so_far[:, window:] - marked_so_far[:, :-window]
+    )
+    lowest_rates = np.fmin.reduce(window_rates, axis=1)
+
+    present_count, absent_count = present_so_far[:, -1], absences_so_far[:, -1]
+    mondays = (start.weekday() + np.arange(days)) % 7 == MONDAY
+    monday_absences = absent[:, mondays].sum(axis=1)
+    monday_marked = monday_absences + present[:, mondays].sum(axis=1)
+    monday_rates = _rate(monday_absences, monday_marked)
+    other_marked = present_count + absent_count - monday_marked
+    other_rates = _rate(absent_count - monday_absences, other_marked)
+    candidates = np.flatnonzero(
+        (monday_absences >= settings.ATTENDANCE_PATTERN_MONDAY_MIN_ABSENCES)
+        & (other_marked >= max(settings.ATTENDANCE_PATTERN_MONDAY_MIN_OTHER_DAYS, 1))
+    )
+    frequent_monday = np.zeros(codes.shape[0], dtype=bool)
+    frequent_monday[candidates] = binomial_tail(
+        monday_absences[candidates].astype(np.int64),
+        monday_marked[candidates].astype(np.int64),
+        other_rates[candidates].astype(np.float64) / 100
+    ) < settings.ATTENDANCE_PATTERN_MONDAY_SIGNIFICANCE
+
+    return {
+        'present': present_count,
+        'absent': absent_count,
+        'attendance_rate': _rate(present_count, present_count + absent_count),
+        'longest_absence_streak': longest_streak,
+        'rolling_rate': window_rates[:, -1],
+        'lowest_rolling_rate': lowest_rates,
+        'monday_absences': monday_absences,
+        'monday_absence_rate': monday_rates,
+        'other_absence_rate': other_rates,
+        'frequent_monday_absences': frequent_monday,
+    }
+
+
+def _as_json(value):
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else round(float(value), 2)
+    return int(value)
+
+
+def employee_patterns(start, end, department=None, flagged_only=False, limit=None, read_preference=None):
+    """
+    Metrics for every employee (or one department, '' for none) over [start, end], as (rows, total)
+
+    Each row is {'employee': raw employee document, **metrics}. Employees
+    without records in the range are left out. Rows are ordered by longest
+    absence streak, then absences (both descending); total counts the
+    matching employees before limit.
+    """
+    query = {}
+    if department is not None:
+        query['department'] = department or {'$in': [None, '']}
+    collection = Employee._get_collection()
+    if read_preference is not None:
+        collection = collection.with_options(read_preference=read_preference)
+    employees = list(collection.find(query))
+
+    codes = load_matrix(
+        [employee['_id'] for employee in employees], start, end, read_preference, whole_roster=department is None
+    )
+    metrics = compute(codes, start)
+
+    selected = metrics['present'] + metrics['absent'] > 0
+    if flagged_only:
+        selected &= metrics['frequent_monday_absences']
+    positions = np.flatnonzero(selected)
+    order = np.lexsort((-metrics['absent'][positions], -metrics['longest_absence_streak'][positions]))
+    positions = positions[order][:limit]
+
+    rows = [
+        {'employee': employees[position], **{name: _as_json(values[position]) for name, values in metrics.items()}}
+        for position in positions
+    ]
+    return rows, int(selected.sum())
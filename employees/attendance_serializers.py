@@ -2,11 +2,101 @@
 Serializers for Attendance API
 """
 from rest_framework import serializers
+from mongoengine.errors import NotUniqueError
+from . import attendance_monthly
 from .attendance_models import Attendance
-from .models import Employee
+from .attendance_summary import employee_department, record_changed, record_created
+from .employee_cache import employee_cache, employee_document
+from .shared_cache import bump_version, employee_scope
+from .serializers import employee_to_dict
+from .field_selection import nested_selection, select_fields
 from datetime import date
 
 
+ATTENDANCE_FIELDS = ('employee', 'date', 'status', 'created_at')
+
+
+def referenced_employee_id(attendance):
+    """
+    Return the ObjectId of the referenced employee without dereferencing it
+    """
+    reference = attendance._data.get('employee')
+    return getattr(reference, 'id', reference)
+
+
+def load_employee_documents(attendance_sons):
+    """
+    Resolve the employees referenced by raw attendance documents
+    
+    Served from the employee cache; misses are fetched with a single $in query.
+    Cached records always hold every employee output field (CACHED_FIELDS), so
+    a ?fields= selection is applied to the output rather than to this query.
+    """
+    employee_ids = {son.get('employee') for son in attendance_sons}
+    employee_ids.discard(None)
+    return employee_cache.get_many_by_id(employee_ids) if employee_ids else {}
+
+
+def attendance_to_dict(son, employee_son):
+    """
+    Represent a raw attendance document (from .as_pymongo()) like AttendanceSerializer does
+    
+    Skips Document construction entirely; this is the fast path for list endpoints.
+    """
+    return {
+        'id': str(son['_id']),
+        'employee': employee_to_dict(employee_son) if employee_son else None,
+        'date': son['date'].date().isoformat() if son.get('date') else None,
+        'status': son.get('status'),
+        'created_at': son['created_at'].isoformat() if son.get('created_at') else None,
+    }
+
+
+def attendance_list_to_dicts(attendance_sons, employee_sons=None, selection=None):
+    """
+    Represent a list of raw attendance documents, batch-loading their employees
+    unless a {ObjectId: employee document} map is supplied
+    
+    Employees are not resolved at all when a ?fields= selection leaves out
+    the employee block; other employee selections are applied by select_fields().
+    """
+    if nested_selection(selection, 'employee') is False:
+        employee_sons = {}
+    elif employee_sons is None:
+        employee_sons = load_employee_documents(attendance_sons)
+    return [
+        select_fields(attendance_to_dict(son, employee_sons.get(son.get('employee'))), selection)
+        for son in attendance_sons
+    ]
+
+
+def attendance_days_to_dicts(days, employee_son, selection):
+    """
+    Represent one employee's (date, status) pairs from month documents like
+    attendance_list_to_dicts, for selections without id and created_at
+    """
+    employee = employee_to_dict(employee_son) if nested_selection(selection, 'employee') is not False else None
+    return [
+        select_fields({'employee': employee, 'date': day.isoformat(), 'status': day_status}, selection)
+        for day, day_status in days
+    ]
+
+
+class AttendanceListSerializer(serializers.ListSerializer):
+    """
+    List serializer that resolves all referenced employees in one batch
+    instead of dereferencing them one record at a time
+    """
+    
+    def to_representation(self, data):
+        records = list(data)
+        if 'employee_map' not in self.context:
+            employee_ids = {referenced_employee_id(record) for record in records}
+            employee_ids.discard(None)
+            self.context['employee_map'] = employee_cache.get_many_by_id(employee_ids)
+        return [self.child.to_representation(record) for record in records]
+
+
 class AttendanceSerializer(serializers.Serializer):
     """
     Serializer for Attendance model
@@ -18,17 +108,21 @@ class AttendanceSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=['Present', 'Absent'], required=True)
     created_at = serializers.DateTimeField(read_only=True)
     
+    class Meta:
+        list_serializer_class = AttendanceListSerializer
+    
     def get_employee(self, obj):
         """Get employee details"""
-        if obj.employee:
-            return {
-                'id': str(obj.employee.id),
-                'employeeId': obj.employee.employeeId,
-                'full_name': obj.employee.full_name,
-                'email': obj.employee.email,
-                'department': obj.employee.department or ''
-            }
-        return None
+        # Use the batch-loaded employees when serializing a list,
+        # otherwise the employee cache instead of dereferencing obj.employee
+        employee_id = referenced_employee_id(obj)
+        employee_map = self.context.get('employee_map')
+        if employee_map is not None:
+            employee = employee_map.get(employee_id)
+        else:
+            employee = employee_cache.get_by_id(employee_id) if employee_id else None
+        
+        return employee_to_dict(employee) if employee else None
     
     def validate_date(self, value):
         """
@@ -45,49 +139,18 @@ class AttendanceSerializer(serializers.Serializer):
         if not value or not value.strip():
             raise serializers.ValidationError("Employee ID is required")
         
-        employee = Employee.objects(employeeId=value.strip()).first()
+        employee = employee_cache.get_by_employee_id(value.strip())
         if not employee:
             raise serializers.ValidationError(f"Employee with ID '{value}' not found")
         
         return value.strip()
     
-    def validate(self, data):
-        """
-        Validate that same employee cannot have duplicate attendance for same date
-        """
-        employee_id = data.get('employeeId')
-        attendance_date = data.get('date')
-        
-        if employee_id and attendance_date:
-            employee = Employee.objects(employeeId=employee_id).first()
-            if employee:
-                # Check if attendance already exists for this employee and date
-                existing_attendance = Attendance.objects(
-                    employee=employee,
-                    date=attendance_date
-                ).first()
-                
-                # If updating, exclude current instance
-                if self.instance:
-                    if existing_attendance and str(existing_attendance.id) != str(self.instance.id):
-                        raise serializers.ValidationError({
-                            'date': f'Attendance for this employee on {attendance_date} already exists'
-                        })
-                else:
-                    # Creating new attendance - prevent duplicate
-                    if existing_attendance:
-                        raise serializers.ValidationError({
-                            'date': f'Attendance for this employee on {attendance_date} already exists.'
-                        })
-        
-        return data
-    
     def create(self, validated_data):
         """
         Create and return a new Attendance instance
         """
         employee_id = validated_data.pop('employeeId')
-        employee = Employee.objects(employeeId=employee_id).first()
+        employee = employee_document(employee_cache.get_by_employee_id(employee_id))
         
         if not employee:
             raise serializers.ValidationError({
@@ -99,28 +162,49 @@ class AttendanceSerializer(serializers.Serializer):
             date=validated_data.get('date'),
             status=validated_data.get('status')
         )
-        attendance.save()
+        # Duplicates are rejected by the unique (employee, date) index
+        try:
+            attendance.save()
+        except NotUniqueError:
+            raise serializers.ValidationError({
+                'date': [f'Attendance for this employee on {attendance.date} already exists.']
+            })
+        record_created(attendance.date, employee.department, attendance.status)
+        attendance_monthly.record_set(employee.pk, attendance.date, attendance.status)
         return attendance
     
     def update(self, instance, validated_data):
         """
         Update and return an existing Attendance instance
         """
+        previous = (instance.date, employee_department(referenced_employee_id(instance)), instance.status)
+        previous_day = (referenced_employee_id(instance), instance.date, instance.status)
+        
         # Update employee if employeeId is provided
         if 'employeeId' in validated_data:
             employee_id = validated_data.pop('employeeId')
-            employee = Employee.objects(employeeId=employee_id).first()
+            employee = employee_document(employee_cache.get_by_employee_id(employee_id))
             if not employee:
                 raise serializers.ValidationError({
                     'employeeId': 'Employee not found'
                 })
+            if employee.pk != referenced_employee_id(instance):
+                # post_save only bumps the new employee's version
+                bump_version(employee_scope(referenced_employee_id(instance)))
             instance.employee = employee
         
         # Update other fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
-        instance.save()
+        try:
+            instance.save()
+        except NotUniqueError:
+            raise serializers.ValidationError({
+                'date': [f'Attendance for this employee on {instance.date} already exists']
+            })
+        record_changed(previous, (instance.date, employee_department(referenced_employee_id(instance)), instance.status))
+        attendance_monthly.record_changed(previous_day, (referenced_employee_id(instance), instance.date, instance.status))
         return instance
     
     def to_representation(self, instance):
@@ -135,3 +219,29 @@ class AttendanceSerializer(serializers.Serializer):
             'created_at': instance.created_at.isoformat() if instance.created_at else None,
         }
         return data
+
+
+class AttendanceMarkSerializer(serializers.Serializer):
+    """
+    Validates a {employeeId, date, status} item for the bulk and upsert endpoints
+    Employee existence is checked by the caller; duplicates by the unique index
+    """
+    employeeId = serializers.CharField(required=True)
+    date = serializers.DateField(required=True)
+    status = serializers.ChoiceField(choices=['Present', 'Absent'], required=True)
+    
+    def validate_date(self, value):
+        """
+        Validate date is not in the future
+        """
+        if value > date.today():
+            raise serializers.ValidationError("Attendance date cannot be in the future")
+        return value
+    
+    def validate_employeeId(self, value):
+        """
+        Validate employeeId is not empty
+        """
+        if not value or not value.strip():
+            raise serializers.ValidationError("Employee ID is required")
+        return value.strip()
@@ -0,0 +1,177 @@
+"""
+Daily attendance rollups: present/absent per (date, department)
+
+Every write path that creates, changes or deletes attendance reports the
+change here and the matching daily_attendance_summary documents are updated
+with a single unordered bulk of $inc upserts. Records are counted under their
+employee's current department, so a department change moves that employee's
+counts, and attendance of deleted employees is not counted.
+
+The incremental counts can drift from the attendance collection: the
+department of a write comes from the employee cache, which can lag a
+department change made on another worker by up to EMPLOYEE_CACHE_TTL
+seconds, and attendance written while move_employee() runs may be moved
+twice or not at all. rebuild() recomputes the counts from the attendance
+collection and is the reconciliation step; run it periodically and after
+bulk department changes.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from pymongo import UpdateOne
+
+from .attendance_models import Attendance, DailyAttendanceSummary, as_datetime
+from .employee_cache import employee_cache
+from .models import Employee
+
+STATUS_FIELDS = {'Present': 'present', 'Absent': 'absent'}
+
+# Department of an employee that does not exist; changes under it are skipped
+UNKNOWN = object()
+
+
+def normalize_department(department):
+    """Empty and missing departments are both counted under None"""
+    return department or None
+
+
+def employee_department(employee_id):
+    """
+    Current department of an employee (by ObjectId) from the employee cache, or UNKNOWN
+    """
+    record = employee_cache.get_by_id(employee_id) if employee_id else None
+    return normalize_department(record.get('department')) if record else UNKNOWN
+
+
+def apply_changes(changes):
+    """
+    Apply (date, department, status, delta) changes with one bulk_write
+
+    Changes to the same day and department are combined first; UNKNOWN
+    departments are skipped. A concurrent first upsert of the same key is
+    retried by the server on the unique (date, department) index.
+    """
+    totals = defaultdict(Counter)
+    for day, department, status, delta in changes:
+        if department is not UNKNOWN and delta:
+            totals[(as_datetime(day), normalize_department(department))][STATUS_FIELDS[status]] += delta
+
+    operations = []
+    for (day, department), counts in totals.items():
+        increments = {field: count for field, count in counts.items() if count}
+        if increments:
+            operations.append(UpdateOne({'date': day, 'department': department}, {'$inc': increments}, upsert=True))
+    if operations:
+        DailyAttendanceSummary._get_collection().bulk_write(operations, ordered=False)
+
+
+def record_created(day, department, status):
+    apply_changes([(day, department, status, 1)])
+
+
+def record_deleted(day, department, status):
+    apply_changes([(day, department, status, -1)])
+
+
+def record_changed(old, new):
+    """
+    old and new are (date, department, status); nothing is written if they match
+    """
+    if old != new:
+        apply_changes([(*old, -1), (*new, 1)])
+
+
+def move_employee(employee_id, old_department, new_department=UNKNOWN):
+    """
+    Move an employee's counts to another department (UNKNOWN: drop them, on delete)
+
+    Not atomic with attendance writes for the same employee; see the module docstring.
+    """
+    if new_department is not UNKNOWN:
+        new_department = normalize_department(new_department)
+    if normalize_department(old_department) == new_department:
+        return
+    groups = Attendance._get_collection().aggregate([
+        {'$match': {'employee': employee_id}},
+        {'$group': {'_id': {'date': '$date', 'status': '$status'}, 'count': {'$sum': 1}}},
+    ])
+    changes = []
+    for group in groups:
+        day, status, count = group['_id']['date'], group['_id']['status'], group['count']
+        changes.append((day, old_department, status, -count))
+        changes.append((day, new_department, status, count))
+    apply_changes(changes)
+
+
+def rebuild(start=None, end=None):
+    """
+    Recompute the summary for [start, end] (dates; None for unbounded) from attendance
+
+    One aggregation per department over the (employee, date) index. Writes
+    that land while it runs can be lost, so run it when attendance is quiet.
+    Returns the number of summary documents written.
+    """
+    date_range = {}
+    if start:
+        date_range['$gte'] = as_datetime(start)
+    if end:
+        date_range['$lte'] = as_datetime(end)
+
+    employees_by_department = defaultdict(list)
+    for row in Employee._get_collection().find({}, {'department': 1}):
+        employees_by_department[normalize_department(row.get('department'))].append(row['_id'])
+
+    counts = defaultdict(Counter)
+    for department, employee_ids in employees_by_department.items():
+        match = {'employee': {'$in': employee_ids}}
+        if date_range:
+            match['date'] = date_range
+        for group in Attendance._get_collection().aggregate([
+            {'$match': match},
+            {'$group': {'_id': {'date': '$date', 'status': '$status'}, 'count': {'$sum': 1}}},
+        ], allowDiskUse=True):
+            counts[(group['_id']['date'], department)][STATUS_FIELDS[group['_id']['status']]] += group['count']
+
+    collection = DailyAttendanceSummary._get_collection()
+    collection.delete_many({'date': date_range} if date_range else {})
+    documents = [
+        {'date': day, 'department': department, 'present': totals['present'], 'absent': totals['absent']}
+        for (day, department), totals in counts.items()
+    ]
+    if documents:
+        collection.insert_many(documents, ordered=False)
+    return len(documents)
+
+
+def daily_series(start, end, department=None):
+    """
+    One entry per day from start to end (inclusive), with totals and a per-department breakdown
+
+    Reads one small document per (day, department) instead of the attendance records.
+    department, if given, restricts the series to that department ('' for none).
+    """
+    query = {'date': {'$gte': as_datetime(start), '$lte': as_datetime(end)}}
+    if department is not None:
+        query['department'] = normalize_department(department)
+
+    by_day = defaultdict(list)
+    for row in DailyAttendanceSummary._get_collection().find(query, {'_id': 0}).sort([('date', 1), ('department', 1)]):
+        if row.get('present') or row.get('absent'):
+            by_day[row['date'].date()].append({
+                'department': row['department'],
+                'present': row.get('present', 0),
+                'absent': row.get('absent', 0),
+            })
+
+    series = []
+    day = start
+    while day <= end:
+        departments = by_day.get(day, [])
+        series.append({
+            'date': day.isoformat(),
+            'present': sum(entry['present'] for entry in departments),
+            'absent': sum(entry['absent'] for entry in departments),
+            'departments': departments,
+        })
+        day += timedelta(days=1)
+    return series
@@ -1,15 +1,88 @@
 """
 Views for Attendance API
 """
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from mongoengine.errors import DoesNotExist, ValidationError
+from mongoengine.errors import DoesNotExist, NotUniqueError, ValidationError
+from bson import ObjectId
 from bson.errors import InvalidId
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from . import attendance_monthly
 from .attendance_models import Attendance
-from .attendance_serializers import AttendanceSerializer
-from .models import Employee
-from datetime import date, datetime
+from .attendance_serializers import (
+    AttendanceMarkSerializer,
+    AttendanceSerializer,
+    attendance_days_to_dicts,
+    attendance_list_to_dicts,
+    referenced_employee_id,
+)
+from .attendance_bulk import mark_attendance_bulk, summarize_results
+from .attendance_export import EXPORT_FORMATS, export_queryset, stream_attendance_export
+from .attendance_summary import daily_series, employee_department, record_changed, record_created, record_deleted
+from .employee_cache import employee_cache, employee_document
+from .shared_cache import (
+    ATTENDANCE,
+    EMPLOYEES,
+    bump_version,
+    cache_response,
+    cached_response,
+    employee_scope,
+)
+from .serializers import employee_to_dict
+from .read_preference import cache_window, read_preference
+from .pagination import ATTENDANCE_ORDERING, PaginationError, page_metadata, paginate
+from .field_selection import (
+    ATTENDANCE_OUTPUT_FIELDS,
+    EMPLOYEE_OUTPUT_FIELDS,
+    FieldSelectionError,
+    database_fields,
+    parse_fields,
+)
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+
+
+STATUS_COUNT_PIPELINE = [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]
+
+# Attendance calendar encoding: one character per day of the year
+CALENDAR_CODES = {'Present': 'P', 'Absent': 'A'}
+CALENDAR_UNMARKED = '-'
+
+
+def statistics_from_groups(groups):
+    """
+    Build the statistics block from STATUS_COUNT_PIPELINE results
+    """
+    statistics = {'total': 0, 'present': 0, 'absent': 0}
+    for group in groups:
+        statistics['total'] += group['count']
+        if group['_id'] in ('Present', 'Absent'):
+            statistics[group['_id'].lower()] = group['count']
+    return statistics
+
+
+def calendar_string(marked_days, year):
+    """
+    Encode (date, status) pairs of one year as one character per day, January 1st first
+    """
+    first = date(year, 1, 1)
+    days = bytearray(CALENDAR_UNMARKED * (date(year + 1, 1, 1) - first).days, 'ascii')
+    for day, day_status in marked_days:
+        days[(day - first).days] = ord(CALENDAR_CODES[day_status])
+    return days.decode('ascii')
+
+
+def get_attendance_statistics(attendance_records):
+    """
+    Count Present/Absent records with a $group on the server
+    
+    The queryset filters become the pipeline's $match stage, so an
+    employee + date range filter is served by the (employee, date) index.
+    """
+    return statistics_from_groups(attendance_records.aggregate(STATUS_COUNT_PIPELINE))
 
 
 @api_view(['GET', 'POST'])
@@ -17,30 +90,46 @@ def attendance_list_create(request):
     """
     List all attendance records or create a new attendance record
     
-    GET /api/attendance/ - List all attendance records
+    GET /api/attendance/ - List attendance records (newest first, paginated)
     GET /api/attendance/?employeeId=EMP001 - Filter by employee ID
     GET /api/attendance/?date=2024-01-15 - Filter by date
+    GET /api/attendance/?limit=50&cursor=<next_cursor> - Fetch the next page
+    GET /api/attendance/?fields=date,status,employee.employeeId - Return only the listed fields
     POST /api/attendance/ - Mark attendance for an employee
     """
     if request.method == 'GET':
         try:
+            try:
+                selection = parse_fields(request, ATTENDANCE_OUTPUT_FIELDS, nested={'employee': EMPLOYEE_OUTPUT_FIELDS})
+            except FieldSelectionError as e:
+                return Response({
+                    'error': True,
+                    'message': 'Invalid fields parameter',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Repeated reads are served from the shared cache (or a 304) until the next write
+            cache_key, response = cached_response(request, (ATTENDANCE, EMPLOYEES), cache_window('attendance_list'))
+            if response is not None:
+                return response
+            
             # Get query parameters
             employee_id = request.query_params.get('employeeId', None)
             attendance_date = request.query_params.get('date', None)
             
             # Start with all attendance records
-            attendance_records = Attendance.objects.all()
+            attendance_records = Attendance.objects.read_preference(read_preference('attendance_list'))
             
             # Filter by employeeId if provided
             if employee_id:
-                employee = Employee.objects(employeeId=employee_id).first()
+                employee = employee_cache.get_by_employee_id(employee_id)
                 if not employee:
                     return Response({
                         'error': True,
                         'message': 'Employee not found',
                         'details': f'No employee found with ID: {employee_id}'
                     }, status=status.HTTP_404_NOT_FOUND)
-                attendance_records = attendance_records.filter(employee=employee)
+                attendance_records = attendance_records.filter(employee=employee['_id'])
             
             # Filter by date if provided
             if attendance_date:
@@ -54,15 +143,25 @@ def attendance_list_create(request):
                         'details': 'Date must be in YYYY-MM-DD format'
                     }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Order by date (newest first)
-            attendance_records = attendance_records.order_by('-date', '-created_at')
+            # Order by date (newest first) and fetch a single page of raw documents.
+            # The sort keys are always read because the next-page cursor is built from them.
+            fields = set(database_fields(selection, ATTENDANCE_OUTPUT_FIELDS)) | {'date', 'created_at'}
+            attendance_records = attendance_records.only(*fields).as_pymongo()
+            try:
+                page, next_cursor = paginate(attendance_records, request, ATTENDANCE_ORDERING)
+            except PaginationError as e:
+                return Response({
+                    'error': True,
+                    'message': 'Invalid pagination parameters',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
             
-            serializer = AttendanceSerializer(attendance_records, many=True)
-            return Response({
+            data = attendance_list_to_dicts(page, selection=selection)
+            return cache_response(cache_key, {
                 'success': True,
-                'data': serializer.data,
-                'count': len(serializer.data)
-            }, status=status.HTTP_200_OK)
+                'data': data,
+                **page_metadata(request, data, next_cursor)
+            })
         except Exception as e:
             return Response({
                 'error': True,
@@ -86,6 +185,12 @@ def attendance_list_create(request):
                     'message': 'Validation failed',
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
+        except serializers.ValidationError as e:
+            return Response({
+                'error': True,
+                'message': 'Validation failed',
+                'details': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({
                 'error': True,
@@ -100,6 +205,166 @@ def attendance_list_create(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+def attendance_bulk_create(request):
+    """
+    Mark attendance for many employees in one request
+    
+    POST /api/attendance/bulk/ - Body is a list of {employeeId, date, status}
+    """
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return Response({
+            'error': True,
+            'message': 'Validation failed',
+            'details': 'Request body must be a non-empty list of attendance records'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if len(items) > settings.ATTENDANCE_BULK_MAX_ITEMS:
+        return Response({
+            'error': True,
+            'message': 'Validation failed',
+            'details': f'At most {settings.ATTENDANCE_BULK_MAX_ITEMS} records can be marked per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        results = mark_attendance_bulk(items)
+        return Response({
+            'success': True,
+            'message': 'Bulk attendance processed',
+            'summary': summarize_results(results),
+            'results': results
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to mark attendance',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['PUT'])
+def attendance_mark(request):
+    """
+    Idempotently set an employee's attendance for a date
+    
+    PUT /api/attendance/mark/ - Body is {employeeId, date, status}; creates or updates the record
+    """
+    serializer = AttendanceMarkSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({
+            'error': True,
+            'message': 'Validation failed',
+            'details': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        employee_id = serializer.validated_data['employeeId']
+        employee = employee_document(employee_cache.get_by_employee_id(employee_id))
+        if not employee:
+            return Response({
+                'error': True,
+                'message': 'Validation failed',
+                'details': {'employeeId': [f"Employee with ID '{employee_id}' not found"]}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Single find-and-modify upsert guarded by the unique (employee, date) index.
+        # Two concurrent first-time upserts can race on the index; the loser retries as an update.
+        # It returns the previous record (None if inserted) for the daily summary; the _id and
+        # created_at of an insert are chosen here, so the response needs no second read.
+        attendance_date = serializer.validated_data['date']
+        attendance_status = serializer.validated_data['status']
+        records = Attendance.objects(employee=employee, date=attendance_date)
+        for attempt in range(2):
+            record_id, created_at = ObjectId(), datetime.utcnow()
+            try:
+                previous = records.modify(
+                    upsert=True,
+                    new=False,
+                    set__status=attendance_status,
+                    set_on_insert__id=record_id,
+                    set_on_insert__created_at=created_at
+                )
+                break
+            except NotUniqueError:
+                if attempt:
+                    raise
+        
+        if previous is None:
+            attendance = Attendance(
+                id=record_id, employee=employee, date=attendance_date, status=attendance_status, created_at=created_at
+            )
+            record_created(attendance_date, employee.department, attendance_status)
+        else:
+            record_changed(
+                (attendance_date, employee.department, previous.status),
+                (attendance_date, employee.department, attendance_status)
+            )
+            attendance = previous
+            attendance.status = attendance_status
+        attendance_monthly.record_set(employee.pk, attendance_date, attendance_status)
+        # modify() skips document signals, so invalidate cached reads here
+        bump_version(ATTENDANCE, employee_scope(employee.pk))
+        
+        return Response({
+            'success': True,
+            'message': 'Attendance marked successfully',
+            'data': AttendanceSerializer(attendance).data
+        }, status=status.HTTP_200_OK)
+    except NotUniqueError:
+        return Response({
+            'error': True,
+            'message': 'Validation failed',
+            'details': {'date': [f"Attendance for this employee on {serializer.validated_data['date']} already exists."]}
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to mark attendance',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@require_GET
+def attendance_export(request):
+    """
+    Stream attendance records as CSV or NDJSON
+    
+    GET /api/attendance/export/?start_date=2024-01-01&end_date=2024-01-31&format=csv
+    GET /api/attendance/export/?start_date=2024-01-01&end_date=2024-01-31&format=ndjson
+    
+    A plain Django view: DRF would treat ?format= as a renderer override.
+    """
+    export_format = request.GET.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({
+            'error': True,
+            'message': 'Invalid export format',
+            'details': f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    date_range = {}
+    for param in ('start_date', 'end_date'):
+        value = request.GET.get(param, None)
+        if value:
+            try:
+                date_range[param] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                return JsonResponse({
+                    'error': True,
+                    'message': f'Invalid {param} format',
+                    'details': 'Date must be in YYYY-MM-DD format'
+                }, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(
+        stream_attendance_export(export_queryset(**date_range), export_format),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    filename = '_'.join(['attendance'] + [value.isoformat() for value in date_range.values()])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
 @api_view(['GET', 'PUT', 'DELETE'])
 def attendance_detail(request, attendance_id):
     """
@@ -160,6 +425,12 @@ def attendance_detail(request, attendance_id):
                     'message': 'Validation failed',
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
+        except serializers.ValidationError as e:
+            return Response({
+                'error': True,
+                'message': 'Validation failed',
+                'details': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({
                 'error': True,
@@ -176,6 +447,8 @@ def attendance_detail(request, attendance_id):
     elif request.method == 'DELETE':
         try:
             attendance.delete()
+            record_deleted(attendance.date, employee_department(referenced_employee_id(attendance)), attendance.status)
+            attendance_monthly.record_cleared(referenced_employee_id(attendance), attendance.date)
             return Response({
                 'success': True,
                 'message': 'Attendance record deleted successfully'
@@ -195,10 +468,21 @@ def employee_attendance(request, employee_id):
     
     GET /api/employees/<employeeId>/attendance/ - Get attendance for employee
     GET /api/employees/<employeeId>/attendance/?start_date=2024-01-01&end_date=2024-01-31 - Filter by date range
+    GET /api/employees/<employeeId>/attendance/?summary_only=true - Statistics only, no records
+    GET /api/employees/<employeeId>/attendance/?fields=date,status - Return only the listed record fields
     """
+    try:
+        selection = parse_fields(request, ATTENDANCE_OUTPUT_FIELDS, nested={'employee': EMPLOYEE_OUTPUT_FIELDS})
+    except FieldSelectionError as e:
+        return Response({
+            'error': True,
+            'message': 'Invalid fields parameter',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
     try:
         # Find employee by employeeId
-        employee = Employee.objects(employeeId=employee_id).first()
+        employee = employee_cache.get_by_employee_id(employee_id)
         if not employee:
             return Response({
                 'error': True,
@@ -206,12 +490,22 @@ def employee_attendance(request, employee_id):
                 'details': f'No employee found with ID: {employee_id}'
             }, status=status.HTTP_404_NOT_FOUND)
         
+        # The per-employee version changes with this employee's record or attendance,
+        # so polling clients get a 304 (or the cached body) until one of those is written
+        cache_key, response = cached_response(
+            request, (employee_scope(employee['_id']),), cache_window('employee_attendance')
+        )
+        if response is not None:
+            return response
+        
         # Get attendance records for this employee
-        attendance_records = Attendance.objects(employee=employee)
+        attendance_records = Attendance.objects(employee=employee['_id'])
+        attendance_records = attendance_records.read_preference(read_preference('employee_attendance'))
         
         # Filter by date range if provided
         start_date = request.query_params.get('start_date', None)
         end_date = request.query_params.get('end_date', None)
+        start_date_obj = end_date_obj = None
         
         if start_date:
             try:
@@ -235,33 +529,49 @@ def employee_attendance(request, employee_id):
                     'details': 'Date must be in YYYY-MM-DD format'
                 }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Order by date (newest first)
-        attendance_records = attendance_records.order_by('-date', '-created_at')
+        summary_only = request.query_params.get('summary_only', '').lower() in ('true', '1', 'yes')
         
-        serializer = AttendanceSerializer(attendance_records, many=True)
+        # Statistics and records come from one source, so they always agree
+        marked_days = None
+        if attendance_monthly.enabled() and (summary_only or attendance_monthly.covers(selection)):
+            # Month bitmasks: about 12 small documents per year instead of one row per day
+            marked_days = list(attendance_monthly.marked_days(
+                attendance_monthly.month_documents(
+                    employee['_id'], start_date_obj, end_date_obj, read_preference('employee_attendance')
+                ),
+                start_date_obj,
+                end_date_obj
+            ))
+            statistics = attendance_monthly.statistics(marked_days)
+        else:
+            # Calculate statistics on the server
+            statistics = get_attendance_statistics(attendance_records)
+        employee_data = employee_to_dict(employee)
         
-        # Calculate statistics
-        total_records = len(serializer.data)
-        present_count = sum(1 for record in serializer.data if record.get('status') == 'Present')
-        absent_count = sum(1 for record in serializer.data if record.get('status') == 'Absent')
+        if summary_only:
+            return cache_response(cache_key, {
+                'success': True,
+                'employee': employee_data,
+                'statistics': statistics
+            })
         
-        return Response({
+        if marked_days is not None:
+            data = attendance_days_to_dicts(marked_days, employee, selection)
+        else:
+            # Order by date (newest first)
+            attendance_records = attendance_records.order_by('-date', '-created_at')
+            attendance_records = attendance_records.only(*database_fields(selection, ATTENDANCE_OUTPUT_FIELDS)).as_pymongo()
+            
+            # Every record references the same employee, which is already loaded
+            data = attendance_list_to_dicts(attendance_records, {employee['_id']: employee}, selection)
+        
+        return cache_response(cache_key, {
             'success': True,
-            'employee': {
-                'id': str(employee.id),
-                'employeeId': employee.employeeId,
-                'full_name': employee.full_name,
-                'email': employee.email,
-                'department': employee.department or ''
-            },
-            'data': serializer.data,
-            'count': total_records,
-            'statistics': {
-                'total': total_records,
-                'present': present_count,
-                'absent': absent_count
-            }
-        }, status=status.HTTP_200_OK)
+            'employee': employee_data,
+            'data': data,
+            'count': len(data),
+            'statistics': statistics
+        })
         
     except Exception as e:
         return Response({
@@ -269,3 +579,129 @@ def employee_attendance(request, employee_id):
             'message': 'Failed to retrieve employee attendance',
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def attendance_daily_summary(request):
+    """
+    Present/absent counts per day, broken down by department, from the daily summary
+    
+    GET /api/attendance/summary/daily/ - The last ATTENDANCE_SUMMARY_DAYS (90) days up to today
+    GET /api/attendance/summary/daily/?days=30&end_date=2024-01-31 - Another window
+    GET /api/attendance/summary/daily/?department=Engineering - One department only
+    """
+    try:
+        days = int(request.query_params.get('days', settings.ATTENDANCE_SUMMARY_DAYS))
+        if not 1 <= days <= settings.ATTENDANCE_SUMMARY_MAX_DAYS:
+            raise ValueError
+    except ValueError:
+        return Response({
+            'error': True,
+            'message': 'Invalid days parameter',
+            'details': f'days must be an integer from 1 to {settings.ATTENDANCE_SUMMARY_MAX_DAYS}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    end_date = request.query_params.get('end_date', None)
+    try:
+        end = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else date.today()
+    except ValueError:
+        return Response({
+            'error': True,
+            'message': 'Invalid end_date format',
+            'details': 'Date must be in YYYY-MM-DD format'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    start = end - timedelta(days=days - 1)
+    department = request.query_params.get('department', None)
+    
+    try:
+        # Keyed by the resolved range, so the default window is not reused after midnight;
+        # department changes move counts, so employee writes invalidate this too
+        parameters = {'start_date': start, 'end_date': end}
+        if department is not None:
+            parameters['department'] = department
+        cache_key, response = cached_response(
+            request, (ATTENDANCE, EMPLOYEES), url=f'{request.path}?{urlencode(parameters)}'
+        )
+        if response is not None:
+            return response
+        
+        data = daily_series(start, end, department)
+        return cache_response(cache_key, {
+            'success': True,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'data': data,
+            'count': len(data)
+        })
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to retrieve attendance summary',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def employee_attendance_calendar(request, employee_id):
+    """
+    One year of an employee's attendance as a compact string, for calendar views
+    
+    GET /api/employees/<employeeId>/attendance/calendar/ - The current year
+    GET /api/employees/<employeeId>/attendance/calendar/?year=2024 - Another year
+    
+    days has one character per day of the year, January 1st first: P (present),
+    A (absent) or - (not marked).
+    """
+    try:
+        year = int(request.query_params.get('year', date.today().year))
+        if not 1900 <= year <= date.today().year:
+            raise ValueError
+    except ValueError:
+        return Response({
+            'error': True,
+            'message': 'Invalid year parameter',
+            'details': f'year must be an integer from 1900 to {date.today().year}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        employee = employee_cache.get_by_employee_id(employee_id)
+        if not employee:
+            return Response({
+                'error': True,
+                'message': 'Employee not found',
+                'details': f'No employee found with ID: {employee_id}'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        cache_key, response = cached_response(
+            request, (employee_scope(employee['_id']),), cache_window('employee_attendance')
+        )
+        if response is not None:
+            return response
+        
+        # A single query: the year's month documents in dual storage mode, otherwise the
+        # year's rows from the (employee, date) index with only date and status returned
+        start, end = date(year, 1, 1), date(year, 12, 31)
+        if attendance_monthly.enabled():
+            marked_days = list(attendance_monthly.marked_days(
+                attendance_monthly.month_documents(employee['_id'], start, end, read_preference('employee_attendance')),
+                start,
+                end
+            ))
+        else:
+            rows = Attendance.objects(employee=employee['_id'], date__gte=start, date__lte=end)
+            rows = rows.read_preference(read_preference('employee_attendance')).only('date', 'status').as_pymongo()
+            marked_days = [(row['date'].date(), row['status']) for row in rows]
+        
+        return cache_response(cache_key, {
+            'success': True,
+            'employee': employee_to_dict(employee),
+            'year': year,
+            'days': calendar_string(marked_days, year),
+            'statistics': attendance_monthly.statistics(marked_days)
+        })
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to retrieve attendance calendar',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,254 @@
+"""
+Employee cache keyed by employeeId and ObjectId: an in-process LRU in front
+of the shared cache (employees/shared_cache.py)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from mongoengine import signals
+
+from .async_db import async_collection
+from .models import Employee
+from .shared_cache import EMPLOYEES, bump_version, employee_scope, get_cache, get_version
+
+CACHED_FIELDS = ('employeeId', 'full_name', 'email', 'department')
+
+
+class EmployeeCache:
+    """
+    Bounded LRU cache of raw employee documents with a TTL
+
+    Records are the dicts returned by .as_pymongo() (_id, employeeId,
+    full_name, email, department) and must be treated as read-only.
+    Local misses are looked up in the shared cache before MongoDB.
+    Every entry is tagged with the shared 'employees' version, so a write
+    on any worker makes all older entries (local and shared) unreachable.
+    """
+
+    def __init__(self, max_size, ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._records = OrderedDict()  # ObjectId -> (expires_at, version, record)
+        self._employee_ids = {}  # employeeId -> ObjectId
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _get_local(self, object_id, version):
+        entry = self._records.get(object_id)
+        if entry is None:
+            return None
+        expires_at, entry_version, record = entry
+        if expires_at <= self.clock() or entry_version != version:
+            self._remove(object_id)
+            return None
+        self._records.move_to_end(object_id)
+        return record
+
+    def _remove(self, object_id):
+        entry = self._records.pop(object_id, None)
+        if entry is not None and self._employee_ids.get(entry[2].get('employeeId')) == object_id:
+            del self._employee_ids[entry[2]['employeeId']]
+
+    def _store(self, records, generation, version):
+        with self._lock:
+            # An invalidation ran while we were querying; the result may be stale
+            if generation != self._generation:
+                return
+            expires_at = self.clock() + self.ttl
+            for record in records:
+                self._remove(record['_id'])
+                self._records[record['_id']] = (expires_at, version, record)
+                self._employee_ids[record['employeeId']] = record['_id']
+            while len(self._records) > self.max_size:
+                self._remove(next(iter(self._records)))
+                self.evictions += 1
+
+    @staticmethod
+    def _shared_key(version, key, by_employee_id):
+        return f"employee:{version}:{'employeeId' if by_employee_id else 'id'}:{key}"
+
+    def _get_shared(self, keys, by_employee_id, version):
+        shared_keys = {self._shared_key(version, key, by_employee_id): key for key in keys}
+        return {shared_keys[shared_key]: record for shared_key, record in get_cache().get_many(shared_keys).items()}
+
+    def _set_shared(self, records, version):
+        entries = {}
+        for record in records:
+            entries[self._shared_key(version, record['_id'], False)] = record
+            entries[self._shared_key(version, record['employeeId'], True)] = record
+        get_cache().set_many(entries, timeout=self.ttl)
+
+    def _lookup_cached(self, keys, by_employee_id):
+        """Local then shared lookup; returns (found, missing keys, generation, version)"""
+        version = get_version(EMPLOYEES)
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                object_id = self._employee_ids.get(key) if by_employee_id else key
+                record = self._get_local(object_id, version) if object_id is not None else None
+                if record is None:
+                    missing.append(key)
+                else:
+                    found[key] = record
+            self.hits += len(found)
+            self.misses += len(missing)
+            generation = self._generation
+
+        if missing:
+            shared = self._get_shared(missing, by_employee_id, version)
+            missing = [key for key in missing if key not in shared]
+            with self._lock:
+                self.shared_hits += len(shared)
+            self._store(list(shared.values()), generation, version)
+            found.update(shared)
+        return found, missing, generation, version
+
+    def _remember(self, found, records, by_employee_id, generation, version):
+        """Cache records fetched from MongoDB and add them to found"""
+        self._set_shared(records, version)
+        self._store(records, generation, version)
+        for record in records:
+            found[record['employeeId'] if by_employee_id else record['_id']] = record
+        return found
+
+    def _lookup(self, keys, by_employee_id):
+        found, missing, generation, version = self._lookup_cached(keys, by_employee_id)
+        if not missing:
+            return found
+        field = 'employeeId__in' if by_employee_id else 'id__in'
+        records = list(Employee.objects(**{field: missing}).only(*CACHED_FIELDS).as_pymongo())
+        return self._remember(found, records, by_employee_id, generation, version)
+
+    async def _alookup(self, keys, by_employee_id):
+        # Same as _lookup, but misses are fetched with the async driver. Shared
+        # cache calls run in a worker thread: the file and redis backends block.
+        found, missing, generation, version = await sync_to_async(self._lookup_cached, thread_sensitive=False)(
+            keys, by_employee_id
+        )
+        if not missing:
+            return found
+        field = 'employeeId' if by_employee_id else '_id'
+        cursor = async_collection(Employee).find({field: {'$in': missing}}, {name: 1 for name in CACHED_FIELDS})
+        records = await cursor.to_list(None)
+        return await sync_to_async(self._remember, thread_sensitive=False)(
+            found, records, by_employee_id, generation, version
+        )
+
+    def get_by_employee_id(self, employee_id):
+        """
+        Return the employee record for an employeeId, or None
+        """
+        return self._lookup([employee_id], by_employee_id=True).get(employee_id)
+
+    def get_by_id(self, object_id):
+        """
+        Return the employee record for an ObjectId, or None
+        """
+        return self._lookup([object_id], by_employee_id=False).get(object_id)
+
+    def get_many_by_employee_id(self, employee_ids):
+        """
+        Return {employeeId: record}, fetching all misses with one $in query
+        """
+        return self._lookup(list(set(employee_ids)), by_employee_id=True)
+
+    def get_many_by_id(self, object_ids):
+        """
+        Return {ObjectId: record}, fetching all misses with one $in query
+        """
+        return self._lookup(list(set(object_ids)), by_employee_id=False)
+
+    async def aget_by_employee_id(self, employee_id):
+        """
+        Async get_by_employee_id()
+        """
+        return (await self._alookup([employee_id], by_employee_id=True)).get(employee_id)
+
+    async def aget_by_id(self, object_id):
+        """
+        Async get_by_id()
+        """
+        return (await self._alookup([object_id], by_employee_id=False)).get(object_id)
+
+    async def aget_many_by_id(self, object_ids):
+        """
+        Async get_many_by_id()
+        """
+        return await self._alookup(list(set(object_ids)), by_employee_id=False)
+
+    def invalidate(self, object_id=None, employee_id=None):
+        """
+        Drop an employee by ObjectId and/or employeeId
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if employee_id is not None:
+                self._remove(self._employee_ids.get(employee_id))
+            if object_id is not None:
+                self._remove(object_id)
+
+    def clear(self):
+        """
+        Drop every locally cached employee (shared entries are dropped by bump_version)
+        """
+        with self._lock:
+            self._generation += 1
+            self._records.clear()
+            self._employee_ids.clear()
+
+    def stats(self):
+        """
+        Hit/miss counters and current size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._records),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_hits': self.shared_hits,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+def employee_document(record):
+    """
+    Build an Employee from a cached record without a database round trip
+    (usable as an Attendance.employee reference)
+    """
+    return Employee._from_son(dict(record)) if record else None
+
+
+employee_cache = EmployeeCache(
+    max_size=settings.EMPLOYEE_CACHE_MAX_SIZE,
+    ttl=settings.EMPLOYEE_CACHE_TTL,
+)
+
+
+def _invalidate_employee(sender, document, **kwargs):
+    """Signal handler for Employee writes"""
+    bump_version(EMPLOYEES, employee_scope(document.pk))
+    employee_cache.invalidate(object_id=document.pk, employee_id=document.employeeId)
+
+
+def connect_signals():
+    """
+    Invalidate cached employees whenever an Employee is saved or deleted
+    """
+    signals.post_save.connect(_invalidate_employee, sender=Employee)
+    signals.post_delete.connect(_invalidate_employee, sender=Employee)
@@ -0,0 +1,143 @@
+"""
+Streaming bulk import of employees from CSV or NDJSON
+"""
+import codecs
+import csv
+import json
+
+from django.conf import settings
+from pymongo.errors import BulkWriteError
+from rest_framework import serializers
+
+from .models import Employee
+from .serializers import DUPLICATE_ERRORS, EmployeeSerializer, duplicate_field
+from .shared_cache import EMPLOYEES, bump_version
+
+DUPLICATE_KEY_ERROR = 11000
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/x-jsonlines': 'ndjson',
+}
+IMPORT_EXTENSIONS = {
+    'csv': 'csv',
+    'ndjson': 'ndjson',
+    'jsonl': 'ndjson',
+}
+
+
+def format_from_filename(filename):
+    """
+    Guess the import format from an uploaded file's extension
+    """
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    return IMPORT_EXTENSIONS.get(extension)
+
+
+def iter_rows(byte_lines, file_format):
+    """
+    Yield (row number, row) pairs from an iterable of encoded lines
+
+    Lines are decoded and parsed one at a time, so the file is never held in memory.
+    Rows that cannot be parsed are yielded as exceptions for the caller to report.
+    """
+    text_lines = codecs.iterdecode(byte_lines, 'utf-8-sig')
+
+    if file_format == 'csv':
+        # Cells missing from a short row read as empty, like blank cells, not None
+        for row_number, row in enumerate(csv.DictReader(text_lines, restval=''), start=1):
+            yield row_number, row
+        return
+
+    row_number = 0
+    for line in text_lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, serializers.ValidationError({'non_field_errors': [f'Invalid JSON: {e}']})
+
+
+class ImportReport:
+    """
+    Running totals for an import, with a bounded sample of row errors
+    """
+
+    def __init__(self):
+        self.counts = {'created': 0, 'duplicate': 0, 'invalid': 0, 'failed': 0}
+        self.errors = []
+
+    def add(self, result, row_number=None, errors=None):
+        self.counts[result] += 1
+        if errors is not None and len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'result': result, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'rows': sum(self.counts.values()),
+            **self.counts,
+            'errors': self.errors,
+            'errors_truncated': sum(self.counts.values()) - self.counts['created'] > len(self.errors),
+        }
+
+
+def _insert_chunk(chunk, report):
+    """
+    Insert one chunk of (row number, document) pairs with an unordered insert_many
+    """
+    documents = [document for _, document in chunk]
+    write_errors = {}
+    try:
+        Employee._get_collection().insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        write_errors = {error['index']: error for error in e.details.get('writeErrors', [])}
+    # insert_many skips document signals, so invalidate cached reads here
+    bump_version(EMPLOYEES)
+
+    for index, (row_number, _) in enumerate(chunk):
+        error = write_errors.get(index)
+        if error is None:
+            report.add('created')
+        elif error.get('code') == DUPLICATE_KEY_ERROR:
+            field = duplicate_field(error.get('errmsg', ''))
+            report.add('duplicate', row_number, {field: [DUPLICATE_ERRORS[field]]})
+        else:
+            report.add('failed', row_number, {'non_field_errors': [error.get('errmsg', 'Write failed')]})
+
+
+def import_employees(byte_lines, file_format):
+    """
+    Validate rows with the EmployeeSerializer rules and insert them in chunks
+
+    Returns an ImportReport. Duplicates (against the database or earlier rows
+    in the same file) are detected by the unique email/employeeId indexes.
+    """
+    report = ImportReport()
+    chunk_size = settings.EMPLOYEE_IMPORT_CHUNK_SIZE
+    row_serializer = EmployeeSerializer()
+    chunk = []
+
+    for row_number, row in iter_rows(byte_lines, file_format):
+        try:
+            if isinstance(row, serializers.ValidationError):
+                raise row
+            data = row_serializer.run_validation(row)
+        except serializers.ValidationError as e:
+            report.add('invalid', row_number, e.detail)
+            continue
+
+        chunk.append((row_number, Employee(**data).to_mongo().to_dict()))
+        if len(chunk) >= chunk_size:
+            _insert_chunk(chunk, report)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(chunk, report)
+    return report
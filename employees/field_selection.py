@@ -0,0 +1,79 @@
+"""
+Sparse field selection (?fields=) for read endpoints
+"""
+
+EMPLOYEE_OUTPUT_FIELDS = ('id', 'employeeId', 'full_name', 'email', 'department')
+ATTENDANCE_OUTPUT_FIELDS = ('id', 'employee', 'date', 'status', 'created_at')
+
+
+class FieldSelectionError(ValueError):
+    """
+    Raised when ?fields= names a field the endpoint does not return
+    """
+
+
+def parse_fields(request, allowed, nested=None):
+    """
+    Parse ?fields=a,b,employee.full_name into {field: None | set(subfields)}
+
+    None for a field means "the whole field". Returns None when the parameter
+    is absent, meaning every field is returned.
+    """
+    raw_fields = request.query_params.get('fields', None)
+    if raw_fields is None:
+        return None
+
+    nested = nested or {}
+    selection = {}
+    for name in filter(None, (part.strip() for part in raw_fields.split(','))):
+        parent, _, child = name.partition('.')
+        if parent not in allowed or (child and child not in nested.get(parent, ())):
+            raise FieldSelectionError(f"Unknown field '{name}'")
+
+        if not child:
+            selection[parent] = None
+        elif parent not in selection:
+            selection[parent] = {child}
+        elif selection[parent] is not None:
+            selection[parent].add(child)
+
+    if not selection:
+        raise FieldSelectionError('fields must name at least one field')
+    return selection
+
+
+def database_fields(selection, output_fields):
+    """
+    MongoEngine .only() arguments needed to produce the selected output fields
+
+    The output 'id' maps to _id, which MongoDB always returns.
+    """
+    if selection is None:
+        return [field for field in output_fields if field != 'id']
+    return [field for field in output_fields if field != 'id' and field in selection] or ['id']
+
+
+def nested_selection(selection, field):
+    """
+    Selection for a nested field: None for all of it, a set of subfields, or False if not selected
+    """
+    if selection is None:
+        return None
+    if field not in selection:
+        return False
+    return selection[field]
+
+
+def select_fields(data, selection):
+    """
+    Drop unselected keys from one representation
+    """
+    if selection is None or data is None:
+        return data
+    selected = {}
+    for field, subfields in selection.items():
+        value = data.get(field)
+        if subfields is not None and isinstance(value, dict):
+            value = {key: item for key, item in value.items() if key in subfields}
+        selected[field] = value
+    return selected
@@ -0,0 +1,338 @@
+"""
+Time every API endpoint at several data sizes against a local MongoDB
+
+    python manage.py bench --sizes 100x30,1000x30,10000x30 --output bench.json
+    python manage.py bench --compare bench.json
+
+For each size (employees x days) a throwaway database is dropped, seeded with
+employees.synthetic and every case below is requested in-process through the
+Django test client, including middleware and rendering but no network. Caches
+are cleared before every request unless --warm is given, so the numbers
+measure the database path.
+"""
+import itertools
+import json
+import platform
+import subprocess
+import time
+from collections import Counter, namedtuple
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import mongoengine
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from employee_management.mongo import EVENT_LISTENERS
+from employees import synthetic
+from employees.attendance_models import Attendance
+from employees.employee_cache import employee_cache
+from employees.models import Employee
+from employees.shared_cache import get_cache
+from employees.urls import urlpatterns
+
+DEFAULT_SIZES = '100x30,1000x30,5000x60'
+BULK_ITEMS = 500
+IMPORT_ROWS = 100
+
+# One timed request per case. build(ctx) returns the request and may do untimed setup
+Case = namedtuple('Case', 'url_name label method build')
+
+
+def request(path, data=None, content_type='application/json'):
+    if data is not None and not isinstance(data, bytes):
+        data = json.dumps(data)
+    return {'path': path, 'data': data or '', 'content_type': content_type}
+
+
+def employee_body(ctx, employee_id, department='Engineering'):
+    n = next(ctx.counter)
+    return {
+        'employeeId': employee_id or f'BENCH{n:06d}',
+        'full_name': f'Bench Employee {n}',
+        'email': f'bench{n:06d}@example.com',
+        'department': department,
+    }
+
+
+def past_day(ctx):
+    """A date before the seeded range, different for every call"""
+    return (ctx.today - timedelta(days=ctx.days + next(ctx.counter) + 1)).isoformat()
+
+
+def throwaway_employee(ctx):
+    employee = Employee(**employee_body(ctx, None))
+    employee.save()
+    return employee
+
+
+def throwaway_attendance(ctx):
+    record = Attendance(employee=ctx.employee['_id'], date=date.fromisoformat(past_day(ctx)), status='Present')
+    record.save()
+    return record
+
+
+def employee_import_body(ctx):
+    rows = [json.dumps(employee_body(ctx, None)) for _ in range(IMPORT_ROWS)]
+    return request('/api/employees/import/', '\n'.join(rows).encode(), 'application/x-ndjson')
+
+
+def attendance_bulk_body(ctx):
+    day = past_day(ctx)
+    return request('/api/attendance/bulk/', [
+        {'employeeId': employee_id, 'date': day, 'status': 'Present'} for employee_id in ctx.bulk_employee_ids
+    ])
+
+
+CASES = [
+    Case('employee-list-create', 'list', 'GET', lambda ctx: request('/api/employees/?limit=100')),
+    Case('employee-list-create', 'create', 'POST', lambda ctx: request('/api/employees/', employee_body(ctx, None))),
+    Case('employee-import', f'ndjson {IMPORT_ROWS} rows', 'POST', employee_import_body),
+    Case('employee-detail', 'get', 'GET', lambda ctx: request(f"/api/employees/{ctx.employee['_id']}/")),
+    Case('employee-detail', 'put', 'PUT', lambda ctx: request(
+        f"/api/employees/{ctx.employee['_id']}/",
+        {**employee_body(ctx, ctx.employee['employeeId']), 'email': ctx.employee['email']}
+    )),
+    Case('employee-detail', 'delete', 'DELETE', lambda ctx: request(f'/api/employees/{throwaway_employee(ctx).pk}/')),
+    Case('employee-partial-update', 'patch', 'PATCH', lambda ctx: request(
+        f"/api/employees/{ctx.employee['_id']}/update/", {'department': 'Sales'}
+    )),
+    Case('attendance-list-create', 'list', 'GET', lambda ctx: request('/api/attendance/?limit=100')),
+    Case('attendance-list-create', 'list by employee', 'GET', lambda ctx: request(
+        f"/api/attendance/?employeeId={ctx.employee['employeeId']}"
+    )),
+    Case('attendance-list-create', 'list by date', 'GET', lambda ctx: request(
+        f'/api/attendance/?date={ctx.last_day}&limit=100'
+    )),
+    Case('attendance-list-create', 'create', 'POST', lambda ctx: request('/api/attendance/', {
+        'employeeId': ctx.employee['employeeId'], 'date': past_day(ctx), 'status': 'Present'
+    })),
+    Case('attendance-bulk-create', f'{BULK_ITEMS} items', 'POST', attendance_bulk_body),
+    Case('attendance-mark', 'mark', 'PUT', lambda ctx: request('/api/attendance/mark/', {
+        'employeeId': ctx.employee['employeeId'], 'date': ctx.last_day, 'status': 'Absent'
+    })),
+    Case('attendance-export', 'ndjson 7 days', 'GET', lambda ctx: request(
+        f'/api/attendance/export/?format=ndjson&start_date={ctx.today - timedelta(days=6)}&end_date={ctx.today}'
+    )),
+    Case('attendance-daily-summary', '90 days', 'GET', lambda ctx: request('/api/attendance/summary/daily/')),
+    Case('department-analytics', '30 days', 'GET', lambda ctx: request('/api/analytics/departments/')),
+    Case('attendance-patterns', '90 days', 'GET', lambda ctx: request('/api/analytics/attendance-patterns/')),
+    Case('attendance-detail', 'get', 'GET', lambda ctx: request(f'/api/attendance/{ctx.attendance_id}/')),
+    Case('attendance-detail', 'put', 'PUT', lambda ctx: request(f'/api/attendance/{ctx.attendance_id}/', {
+        'employeeId': ctx.employee['employeeId'], 'date': ctx.attendance_date, 'status': 'Present'
+    })),
+    Case('attendance-detail', 'delete', 'DELETE', lambda ctx: request(
+        f'/api/attendance/{throwaway_attendance(ctx).pk}/'
+    )),
+    Case('employee-attendance', 'records', 'GET', lambda ctx: request(
+        f"/api/employees/{ctx.employee['employeeId']}/attendance/"
+    )),
+    Case('employee-attendance', 'summary only', 'GET', lambda ctx: request(
+        f"/api/employees/{ctx.employee['employeeId']}/attendance/?summary_only=true"
+    )),
+    Case('employee-attendance-calendar', 'this year', 'GET', lambda ctx: request(
+        f"/api/employees/{ctx.employee['employeeId']}/attendance/calendar/"
+    )),
+    Case('system-stats', 'get', 'GET', lambda ctx: request('/api/system/stats/')),
+    Case('metrics', 'get', 'GET', lambda ctx: request('/api/metrics/')),
+]
+
+
+def parse_size(value):
+    try:
+        employees, days = value.lower().split('x')
+        return int(employees), int(days)
+    except ValueError:
+        raise CommandError(f'Invalid size {value!r}; expected EMPLOYEESxDAYS, e.g. 1000x30')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def server_timing(response):
+    """(db milliseconds, command count) from the Server-Timing header, or (None, None)"""
+    for entry in response.get('Server-Timing', '').split(','):
+        name, *params = [part.strip() for part in entry.split(';')]
+        if name == 'db':
+            values = dict(param.split('=', 1) for param in params)
+            return float(values['dur']), int(values['desc'].strip('"').split()[0])
+    return None, None
+
+
+def clear_caches():
+    employee_cache.clear()
+    get_cache().clear()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Time every endpoint in employees/urls.py at several data sizes (drops and reseeds --db)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Comma-separated EMPLOYEESxDAYS (default {DEFAULT_SIZES})')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per case (default 20)')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per case first (default 2)')
+        parser.add_argument('--host', default='mongodb://localhost:27017', help='MongoDB to benchmark against')
+        parser.add_argument('--db', default='employee_db_bench', help='Database to drop and seed (default employee_db_bench)')
+        parser.add_argument('--warm', action='store_true', help='Keep the employee and response caches between requests')
+        parser.add_argument('--only', help='Comma-separated URL names to run (default: all)')
+        parser.add_argument('--output', help='Write the JSON results to this file')
+        parser.add_argument('--json', action='store_true', help='Print the JSON results instead of a table')
+        parser.add_argument('--compare', help='Earlier --output file to compare p50 latencies against')
+        parser.add_argument('--threshold', type=float, default=25.0, help='Flag p50 increases above this percentage (default 25)')
+        parser.add_argument('--keep', action='store_true', help='Do not drop the database at the end')
+
+    def handle(self, *args, **options):
+        if options['db'] == settings.MONGODB_NAME:
+            raise CommandError(f"--db {options['db']} is the application database; the benchmark drops it")
+        sizes = [parse_size(size) for size in options['sizes'].split(',')]
+        only = set(options['only'].split(',')) if options['only'] else None
+        cases = [case for case in CASES if only is None or case.url_name in only]
+
+        mongoengine.disconnect()
+        connection = mongoengine.connect(db=options['db'], host=options['host'], event_listeners=EVENT_LISTENERS)
+        report = {
+            'started_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'mongodb': connection.server_info()['version'],
+            'async_views': settings.ASYNC_VIEWS,
+            'cache_backend': settings.CACHE_BACKEND,
+            'warm': options['warm'],
+            'iterations': options['iterations'],
+            'not_benchmarked': sorted({pattern.name for pattern in urlpatterns} - {case.url_name for case in CASES}),
+            'results': [],
+        }
+
+        # Async views open their own motor client from these settings
+        with override_settings(MONGODB_HOST=options['host'], MONGODB_NAME=options['db']):
+            try:
+                for employees, days in sizes:
+                    report['results'].extend(self.run_size(connection, options, cases, employees, days))
+            finally:
+                if not options['keep']:
+                    connection.drop_database(options['db'])
+                mongoengine.disconnect()
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(report)
+        if options['compare']:
+            self.print_comparison(report, options['compare'], options['threshold'])
+
+    def run_size(self, connection, options, cases, employees, days):
+        connection.drop_database(options['db'])
+        clear_caches()
+        seeded = synthetic.seed(employees, days)
+        if not options['json']:
+            self.stderr.write(f"{employees}x{days}: seeded {seeded['attendance']} attendance records")
+
+        employee = Employee._get_collection().find_one({'employeeId': f'{synthetic.DEFAULT_PREFIX}{1:06d}'})
+        attendance = Attendance._get_collection().find_one({'employee': employee['_id']}, sort=[('date', -1)])
+        ctx = SimpleNamespace(
+            counter=itertools.count(),
+            today=date.today(),
+            days=days,
+            last_day=attendance['date'].date().isoformat(),
+            employee=employee,
+            attendance_id=attendance['_id'],
+            attendance_date=attendance['date'].date().isoformat(),
+            bulk_employee_ids=[f'{synthetic.DEFAULT_PREFIX}{i:06d}' for i in range(1, min(employees, BULK_ITEMS) + 1)],
+        )
+
+        client = Client()
+        results = []
+        for case in cases:
+            durations, db_durations, commands, statuses = [], [], [], Counter()
+            for iteration in range(options['warmup'] + options['iterations']):
+                spec = case.build(ctx)
+                if not options['warm']:
+                    clear_caches()
+                started = time.perf_counter()
+                response = client.generic(case.method, spec['path'], spec['data'], spec['content_type'])
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = (time.perf_counter() - started) * 1000
+                if iteration < options['warmup']:
+                    continue
+                durations.append(elapsed)
+                statuses[response.status_code] += 1
+                db_ms, command_count = server_timing(response)
+                if db_ms is not None:
+                    db_durations.append(db_ms)
+                    commands.append(command_count)
+
+            results.append({
+                'size': f'{employees}x{days}',
+                'employees': employees,
+                'days': days,
+                'attendance': seeded['attendance'],
+                'url_name': case.url_name,
+                'case': case.label,
+                'method': case.method,
+                'statuses': {str(code): count for code, count in sorted(statuses.items())},
+                'ms': {
+                    'min': round(min(durations), 3),
+                    'p50': round(percentile(durations, 0.5), 3),
+                    'p95': round(percentile(durations, 0.95), 3),
+                    'max': round(max(durations), 3),
+                    'mean': round(sum(durations) / len(durations), 3),
+                },
+                'db_ms_p50': round(percentile(db_durations, 0.5), 3) if db_durations else None,
+                'commands_p50': percentile(commands, 0.5) if commands else None,
+            })
+        return results
+
+    def print_table(self, report):
+        self.stdout.write(
+            f"{'size':>10}  {'endpoint':<48} {'status':<10} {'p50 ms':>9} {'p95 ms':>9} {'db ms':>8} {'cmds':>5}"
+        )
+        for result in report['results']:
+            self.stdout.write(
+                f"{result['size']:>10}  {result['method'] + ' ' + result['url_name'] + ' ' + result['case']:<48} "
+                f"{','.join(result['statuses']):<10} {result['ms']['p50']:>9.2f} {result['ms']['p95']:>9.2f} "
+                f"{result['db_ms_p50'] if result['db_ms_p50'] is not None else '-':>8} "
+                f"{result['commands_p50'] if result['commands_p50'] is not None else '-':>5}"
+            )
+        if report['not_benchmarked']:
+            self.stdout.write(self.style.WARNING(f"No bench case for: {', '.join(report['not_benchmarked'])}"))
+
+    def print_comparison(self, report, path, threshold):
+        with open(path) as previous_file:
+            previous = {
+                (result['size'], result['url_name'], result['case']): result
+                for result in json.load(previous_file)['results']
+            }
+        self.stdout.write(f"\nCompared with {path} (p50 ms):")
+        slower = 0
+        for result in report['results']:
+            before = previous.get((result['size'], result['url_name'], result['case']))
+            if not before:
+                continue
+            old, new = before['ms']['p50'], result['ms']['p50']
+            change = (new - old) / old * 100 if old else 0.0
+            line = (
+                f"{result['size']:>10}  {result['method'] + ' ' + result['url_name'] + ' ' + result['case']:<48} "
+                f"{old:>9.2f} -> {new:>9.2f} {change:>+7.1f}%"
+            )
+            if change > threshold:
+                slower += 1
+                line = self.style.WARNING(line + '  slower')
+            self.stdout.write(line)
+        self.stdout.write(f'{slower} case(s) more than {threshold:g}% slower')
@@ -0,0 +1,58 @@
+"""
+Replace the legacy non-unique (employee, date) attendance index with a unique one
+"""
+from django.core.management.base import BaseCommand, CommandError
+from mongoengine.connection import get_db
+
+from employees import attendance_monthly, attendance_summary
+from employees.attendance_models import Attendance
+from employees.shared_cache import ATTENDANCE, bump_version, employee_scope
+
+
+class Command(BaseCommand):
+    help = 'Make the (employee, date) attendance index unique, optionally removing duplicate records first'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete-duplicates',
+            action='store_true',
+            help='Keep the newest record of each duplicate (employee, date) pair and delete the rest',
+        )
+
+    def handle(self, *args, **options):
+        # Use the raw collection: Attendance._get_collection() would try to
+        # create the unique index and fail while the old one still exists
+        collection = get_db()[Attendance._meta['collection']]
+
+        duplicates = list(collection.aggregate([
+            {'$sort': {'created_at': -1}},
+            {'$group': {'_id': {'employee': '$employee', 'date': '$date'}, 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+            {'$match': {'count': {'$gt': 1}}},
+        ], allowDiskUse=True))
+
+        if duplicates:
+            if not options['delete_duplicates']:
+                raise CommandError(
+                    f'{len(duplicates)} (employee, date) pairs have more than one record. '
+                    'Re-run with --delete-duplicates to keep only the newest record of each.'
+                )
+            stale_ids = [record_id for group in duplicates for record_id in group['ids'][1:]]
+            collection.delete_many({'_id': {'$in': stale_ids}})
+            bump_version(ATTENDANCE, *{employee_scope(group['_id']['employee']) for group in duplicates})
+            self.stdout.write(f'Deleted {len(stale_ids)} duplicate attendance records')
+
+        for name, spec in collection.index_information().items():
+            if spec['key'] == [('employee', 1), ('date', 1)] and not spec.get('unique'):
+                collection.drop_index(name)
+                self.stdout.write(f'Dropped non-unique index {name}')
+
+        Attendance.ensure_indexes()
+
+        # The rollups go through Attendance._get_collection(), which is only safe
+        # to call once the unique index can be created
+        if duplicates:
+            dates = [group['_id']['date'] for group in duplicates]
+            attendance_summary.rebuild(min(dates), max(dates))
+            if attendance_monthly.enabled():
+                attendance_monthly.rebuild({group['_id']['employee'] for group in duplicates})
+        self.stdout.write(self.style.SUCCESS('Attendance indexes are up to date'))
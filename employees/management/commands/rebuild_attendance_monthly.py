@@ -0,0 +1,39 @@
+"""
+Recompute the per-month attendance bitmasks from the attendance collection
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from employees import attendance_monthly
+from employees.employee_cache import employee_cache
+from employees.models import Employee
+from employees.shared_cache import bump_version, employee_scope
+
+
+class Command(BaseCommand):
+    help = 'Rebuild attendance_monthly (all employees, or --employee) from attendance records'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employee', action='append', default=[], metavar='EMPLOYEE_ID',
+            help='Only this employeeId (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        employee_ids = []
+        for employee_id in options['employee']:
+            employee = employee_cache.get_by_employee_id(employee_id)
+            if not employee:
+                raise CommandError(f'No employee found with ID: {employee_id}')
+            employee_ids.append(employee['_id'])
+
+        written = attendance_monthly.rebuild(employee_ids or None)
+        # Employee attendance responses are cached per employee
+        if not employee_ids:
+            employee_ids = [row['_id'] for row in Employee._get_collection().find({}, {'_id': 1})]
+        bump_version(*(employee_scope(employee_id) for employee_id in employee_ids))
+
+        if not attendance_monthly.enabled():
+            self.stdout.write(self.style.WARNING(
+                "ATTENDANCE_STORAGE_MODE is not 'dual', so writes will not keep these documents current"
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} monthly attendance documents'))
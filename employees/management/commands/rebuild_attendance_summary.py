@@ -0,0 +1,32 @@
+"""
+Recompute the daily attendance summary from the attendance collection
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees import attendance_summary
+from employees.shared_cache import ATTENDANCE, bump_version
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}; expected YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily_attendance_summary (all dates, or --start/--end) from attendance records'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_date, help='First date to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', type=parse_date, help='Last date to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        if options['start'] and options['end'] and options['start'] > options['end']:
+            raise CommandError('--start must not be after --end')
+
+        written = attendance_summary.rebuild(options['start'], options['end'])
+        bump_version(ATTENDANCE)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} daily summary documents'))
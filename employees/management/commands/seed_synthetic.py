@@ -0,0 +1,54 @@
+"""
+Generate synthetic employees and attendance with bulk inserts
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees import synthetic
+
+
+class Command(BaseCommand):
+    help = 'Insert N synthetic employees across departments with M days of attendance each'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000, help='Number of employees (default 1000)')
+        parser.add_argument('--days', type=int, default=30, help='Calendar days of attendance, ending today (default 30)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--prefix', default=synthetic.DEFAULT_PREFIX, help='employeeId prefix (default SYN)')
+        parser.add_argument('--weekends', action='store_true', help='Also mark Saturdays and Sundays')
+        parser.add_argument('--batch-size', type=int, default=synthetic.DEFAULT_BATCH_SIZE, help='Documents per insert_many')
+        parser.add_argument('--clear', action='store_true', help='First delete employees (and attendance) with this prefix')
+        parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    def handle(self, *args, **options):
+        if options['employees'] < 1 or options['days'] < 0:
+            raise CommandError('--employees must be at least 1 and --days at least 0')
+
+        if options['clear']:
+            employees, records = synthetic.clear(options['prefix'])
+            if not options['json']:
+                self.stdout.write(f'Deleted {employees} employees and {records} attendance records')
+        elif synthetic.synthetic_employee_ids(options['prefix']):
+            raise CommandError(
+                f"Employees with prefix {options['prefix']} already exist. "
+                'Re-run with --clear to replace them, or use another --prefix.'
+            )
+
+        summary = synthetic.seed(
+            options['employees'],
+            options['days'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            weekends=options['weekends'],
+            batch_size=options['batch_size'],
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary))
+            return
+        absent_share = summary['absent'] / summary['attendance'] * 100 if summary['attendance'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Inserted {summary['employees']} employees in {summary['employees_seconds']}s and "
+            f"{summary['attendance']} attendance records ({absent_share:.1f}% absent) in {summary['attendance_seconds']}s"
+        ))
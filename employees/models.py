@@ -25,19 +25,12 @@ class Employee(Document):
     
     def clean(self):
         """
-        Custom validation before saving
+        Custom validation before saving (called by save() through validate())
         """
         # Validate email format
         email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_pattern, self.email):
             raise ValueError("Invalid email format")
     
-    def save(self, *args, **kwargs):
-        """
-        Override save to validate
-        """
-        self.clean()
-        return super(Employee, self).save(*args, **kwargs)
-    
     def __str__(self):
         return f"{self.full_name} ({self.email})"
@@ -0,0 +1,166 @@
+"""
+Cursor (keyset) pagination for list endpoints
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from bson import ObjectId, json_util
+from bson.errors import BSONError
+from django.conf import settings
+
+
+# Types a sort key value can have; anything else in a cursor (e.g. a query
+# operator document) is rejected before it reaches the query
+CURSOR_VALUE_TYPES = (datetime, ObjectId, type(None))
+
+# Sort keys as (database field, direction). The last key must be unique so
+# every document has exactly one position in the ordering.
+ATTENDANCE_ORDERING = (('date', -1), ('created_at', -1), ('_id', -1))
+EMPLOYEE_ORDERING = (('_id', 1),)
+
+
+class PaginationError(ValueError):
+    """
+    Raised when the limit or cursor query parameters are invalid
+    """
+
+
+def parse_limit(request):
+    """
+    Read ?limit= from the request, falling back to the default page size
+    """
+    raw_limit = request.query_params.get('limit', None)
+    if raw_limit in (None, ''):
+        return settings.API_PAGE_SIZE
+
+    try:
+        limit = int(raw_limit)
+    except ValueError:
+        raise PaginationError('limit must be a positive integer')
+
+    if limit < 1:
+        raise PaginationError('limit must be a positive integer')
+    return min(limit, settings.API_MAX_PAGE_SIZE)
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key values of the last returned document as an opaque token
+    """
+    payload = json_util.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, ordering):
+    """
+    Decode a cursor token back into sort key values
+
+    Only datetimes, ObjectIds and None are accepted, since they are spliced into the query.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError, TypeError, ArithmeticError, BSONError):
+        # Extended JSON values can fail in their own ways, e.g. {"$oid": "zz"}
+        # (InvalidId) or {"$date": 1e400} (OverflowError)
+        raise PaginationError('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise PaginationError('Invalid cursor')
+    if not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise PaginationError('Invalid cursor')
+    return values
+
+
+def cursor_values(ordering, son):
+    """
+    Extract the sort key values from a raw MongoDB document
+    """
+    return [son.get(field) for field, _ in ordering]
+
+
+def keyset_filter(ordering, values):
+    """
+    Build a raw query matching documents strictly after the cursor position
+
+    For keys (a, b, c) this is: a < x OR (a == x AND b < y) OR (a == x AND b == y AND c < z),
+    with the comparison flipped for ascending keys.
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(ordering):
+        clause = {f: value for (f, _), value in zip(ordering[:position], values[:position])}
+        clause[field] = {'$lt' if direction < 0 else '$gt': values[position]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {'$or': clauses}
+
+
+def order_by_fields(ordering):
+    """
+    Translate an ordering into MongoEngine order_by() arguments
+    """
+    return [
+        ('-' if direction < 0 else '') + ('id' if field == '_id' else field)
+        for field, direction in ordering
+    ]
+
+
+def next_page_link(request, cursor):
+    """
+    Build an absolute URL for the next page, keeping the other query parameters
+    """
+    query_params = request.query_params.copy()
+    query_params['cursor'] = cursor
+    return request.build_absolute_uri(f"{request.path}?{query_params.urlencode()}")
+
+
+def paginate(queryset, request, ordering):
+    """
+    Return one page of documents and the cursor for the next page
+
+    Fetches limit + 1 documents so the presence of a next page is known
+    without a separate count query. Works with Document and .as_pymongo() querysets.
+    """
+    limit = parse_limit(request)
+    token = request.query_params.get('cursor', None)
+    if token:
+        queryset = queryset.filter(__raw__=keyset_filter(ordering, decode_cursor(token, ordering)))
+
+    documents = list(queryset.order_by(*order_by_fields(ordering)).limit(limit + 1))
+    if len(documents) <= limit:
+        return documents, None
+
+    documents = documents[:limit]
+    last = documents[-1]
+    son = last if isinstance(last, dict) else last.to_mongo()
+    return documents, encode_cursor(cursor_values(ordering, son))
+
+
+async def paginate_collection(collection, query, projection, request, ordering):
+    """
+    Async paginate() for a motor collection and a raw query
+    """
+    limit = parse_limit(request)
+    token = request.query_params.get('cursor', None)
+    if token:
+        after_cursor = keyset_filter(ordering, decode_cursor(token, ordering))
+        query = {'$and': [query, after_cursor]} if query else after_cursor
+
+    cursor = collection.find(query, projection).sort(list(ordering)).limit(limit + 1)
+    documents = await cursor.to_list(limit + 1)
+    if len(documents) <= limit:
+        return documents, None
+
+    documents = documents[:limit]
+    return documents, encode_cursor(cursor_values(ordering, documents[-1]))
+
+
+def page_metadata(request, page, next_cursor):
+    """
+    Response fields describing the current page
+    """
+    return {
+        'count': len(page),
+        'next_cursor': next_cursor,
+        'next': next_page_link(request, next_cursor) if next_cursor else None,
+    }
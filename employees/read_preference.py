@@ -0,0 +1,62 @@
+"""
+Per-endpoint read preferences for list and reporting endpoints
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+
+PRIMARY = 'primary'
+# MongoDB's floor for maxStalenessSeconds (-1 means no limit)
+MIN_MAX_STALENESS_SECONDS = 90
+
+
+def read_mode(endpoint):
+    """
+    Configured read preference name for an endpoint (settings.API_READ_PREFERENCES)
+    """
+    return settings.API_READ_PREFERENCES.get(endpoint) or PRIMARY
+
+
+def read_preference(endpoint):
+    """
+    pymongo read preference for an endpoint's queries
+
+    maxStalenessSeconds (READ_PREFERENCE_MAX_STALENESS_SECONDS) applies to
+    every mode except primary. Writes never use this.
+    """
+    mode = read_pref_mode_from_name(read_mode(endpoint))
+    if not mode:
+        return make_read_preference(mode, None)
+    return make_read_preference(mode, None, settings.READ_PREFERENCE_MAX_STALENESS_SECONDS)
+
+
+def check_settings():
+    """
+    Fail at startup, not on the first request, on an unknown read preference
+    name or a maxStalenessSeconds the server would reject
+    """
+    max_staleness = settings.READ_PREFERENCE_MAX_STALENESS_SECONDS
+    if max_staleness != -1 and max_staleness < MIN_MAX_STALENESS_SECONDS:
+        raise ImproperlyConfigured(
+            f'READ_PREFERENCE_MAX_STALENESS_SECONDS must be -1 or at least {MIN_MAX_STALENESS_SECONDS}, '
+            f'got {max_staleness}'
+        )
+    for endpoint in settings.API_READ_PREFERENCES:
+        try:
+            read_preference(endpoint)
+        except Exception as e:
+            raise ImproperlyConfigured(f'Invalid read preference for {endpoint}: {e}')
+
+
+def cache_window(endpoint):
+    """
+    Seconds a response may be cached (and keep its ETag) when the endpoint
+    reads from secondaries, or None on the primary
+
+    A version bump does not wait for replication, so a lagging secondary can
+    return pre-write data under the new version; the window bounds how long
+    that stays cached.
+    """
+    if read_mode(endpoint) == PRIMARY:
+        return None
+    return settings.SECONDARY_READ_CACHE_SECONDS
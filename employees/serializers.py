@@ -2,10 +2,55 @@
 Serializers for Employee API
 """
 from rest_framework import serializers
+from mongoengine.errors import NotUniqueError
 from .models import Employee
+from .attendance_summary import move_employee
 import re
 
 
+DUPLICATE_ERRORS = {
+    'email': 'Employee with this email already exists',
+    'employeeId': 'Employee with this Employee ID already exists',
+}
+
+
+def duplicate_field(error):
+    """
+    Return the field whose unique index rejected the write
+    """
+    match = re.search(r'index: (\w+?)_1\b', str(error))
+    if match and match.group(1) in DUPLICATE_ERRORS:
+        return match.group(1)
+    return 'employeeId' if 'employeeId' in str(error) else 'email'
+
+
+def employee_to_dict(son):
+    """
+    Represent a raw employee document (from .as_pymongo()) like EmployeeSerializer does
+    """
+    return {
+        'id': str(son['_id']),
+        'employeeId': son.get('employeeId'),
+        'full_name': son.get('full_name'),
+        'email': son.get('email'),
+        'department': son.get('department') or '',
+    }
+
+
+def save_employee(employee, **kwargs):
+    """
+    Save an employee that the serializer has already validated
+
+    Skips the model-level validation (it would re-run the email regex) and
+    maps unique index violations back to field errors.
+    """
+    try:
+        employee.save(validate=False, **kwargs)
+    except NotUniqueError as e:
+        field = duplicate_field(e)
+        raise serializers.ValidationError({field: DUPLICATE_ERRORS[field]})
+
+
 class EmployeeSerializer(serializers.Serializer):
     """
     Serializer for Employee model
@@ -46,53 +91,25 @@ class EmployeeSerializer(serializers.Serializer):
         """
         Create and return a new Employee instance
         """
-        # Check for duplicate email
-        email = validated_data.get('email')
-        if Employee.objects(email=email).first():
-            raise serializers.ValidationError({
-                'email': 'Employee with this email already exists'
-            })
-        
-        # Check for duplicate employeeId
-        employee_id = validated_data.get('employeeId')
-        if Employee.objects(employeeId=employee_id).first():
-            raise serializers.ValidationError({
-                'employeeId': 'Employee with this Employee ID already exists'
-            })
-        
+        # Duplicate email/employeeId are rejected by the unique indexes,
+        # so creation is a single insert
         employee = Employee(**validated_data)
-        employee.save()
+        save_employee(employee, force_insert=True)
         return employee
     
     def update(self, instance, validated_data):
         """
         Update and return an existing Employee instance
         """
-        # Check for duplicate email if email is being updated
-        email = validated_data.get('email', instance.email)
-        if email != instance.email:
-            # Check if another employee with this email exists (excluding current instance)
-            existing_employee = Employee.objects(email=email).first()
-            if existing_employee and str(existing_employee.id) != str(instance.id):
-                raise serializers.ValidationError({
-                    'email': 'Employee with this email already exists'
-                })
-        
-        # Check for duplicate employeeId if employeeId is being updated
-        employee_id = validated_data.get('employeeId', instance.employeeId)
-        if employee_id != instance.employeeId:
-            # Check if another employee with this employeeId exists (excluding current instance)
-            existing_employee = Employee.objects(employeeId=employee_id).first()
-            if existing_employee and str(existing_employee.id) != str(instance.id):
-                raise serializers.ValidationError({
-                    'employeeId': 'Employee with this Employee ID already exists'
-                })
+        previous_department = instance.department
         
         # Update fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
-        instance.save()
+        save_employee(instance)
+        # The daily summary counts attendance under the employee's current department
+        move_employee(instance.pk, previous_department, instance.department)
         return instance
     
     def to_representation(self, instance):
@@ -0,0 +1,180 @@
+"""
+Cross-worker cache layer on top of Django's cache framework
+
+Invalidation is version based: each data scope ('employees', 'attendance',
+and one per employee) has a version in the shared cache that is replaced on
+every write. Cache keys and ETags embed the versions they were built from,
+so after a bump every worker stops serving the old entries (which then
+simply expire) without per-key deletes.
+"""
+import hashlib
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags, quote_etag
+from mongoengine import signals
+from rest_framework import status
+from rest_framework.response import Response
+
+EMPLOYEES = 'employees'
+ATTENDANCE = 'attendance'
+
+
+def get_cache():
+    """
+    The configured shared cache (settings.API_CACHE_ALIAS)
+    """
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(scope):
+    return f'data-version:{scope}'
+
+
+def _new_version():
+    # Versions only need to differ from every earlier value, not to increase:
+    # a random token stays safe when a counter is evicted and recreated
+    return uuid.uuid4().hex[:16]
+
+
+def employee_scope(object_id):
+    """
+    Scope for one employee's record and attendance (per-employee version)
+    """
+    return f'employee:{object_id}'
+
+
+def get_versions(*scopes):
+    """
+    Current version of each scope, in order, with one cache round trip
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # First use (or evicted); add() keeps a concurrent writer's value
+            cache.add(key, _new_version(), timeout=None)
+            found[key] = cache.get(key) or _new_version()
+    return [found[key] for key in keys]
+
+
+def get_version(scope):
+    """
+    Current version of one scope
+    """
+    return get_versions(scope)[0]
+
+
+def bump_version(*scopes):
+    """
+    Invalidate everything cached for the given scopes, in one cache round trip
+    """
+    if scopes:
+        get_cache().set_many({_version_key(scope): _new_version() for scope in scopes}, timeout=None)
+
+
+def response_cache_key(request, scopes, window=None, url=None):
+    """
+    Key for a cached response: full URL (host, path, query) plus data versions
+
+    With a window (seconds) the key also changes every window seconds, which
+    bounds how long one response is reused even without writes. url replaces
+    the request's URL, e.g. a canonical one with default parameters resolved.
+    """
+    parts = [request.build_absolute_uri(url), *scopes, *get_versions(*scopes)]
+    if window:
+        parts.append(str(int(time.time() // window)))
+    digest = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+    return f'response:{digest}'
+
+
+def response_headers(cache_key):
+    """
+    Validator headers for a response built for cache_key
+
+    The key changes whenever the URL or the data changes, so it doubles as a strong ETag.
+    """
+    return {'ETag': quote_etag(cache_key.split(':', 1)[1]), 'Cache-Control': 'no-cache'}
+
+
+def lookup_response(request, scopes, window=None, url=None):
+    """
+    Look up a read in the shared cache before running it
+
+    Returns (cache_key, not_modified, data): not_modified is True when the
+    client's If-None-Match matches the current ETag, data is the cached body
+    or None when the view has to build it (then pass it to store_response).
+    """
+    cache_key = response_cache_key(request, scopes, window, url)
+    if response_headers(cache_key)['ETag'] in parse_etags(request.headers.get('If-None-Match', '')):
+        return cache_key, True, None
+    return cache_key, False, get_cache().get(cache_key)
+
+
+def store_response(cache_key, data):
+    """
+    Store response data built for cache_key
+    """
+    get_cache().set(cache_key, data, timeout=settings.API_RESPONSE_CACHE_TIMEOUT)
+
+
+async def alookup_response(request, scopes, window=None, url=None):
+    """
+    Async lookup_response(), run in a worker thread (the file and redis backends block)
+    """
+    return await sync_to_async(lookup_response, thread_sensitive=False)(request, scopes, window, url)
+
+
+async def astore_response(cache_key, data):
+    """
+    Async store_response(), run in a worker thread
+    """
+    await sync_to_async(store_response, thread_sensitive=False)(cache_key, data)
+
+
+def _with_headers(response, cache_key):
+    for header, value in response_headers(cache_key).items():
+        response[header] = value
+    return response
+
+
+def cached_response(request, scopes, window=None, url=None):
+    """
+    DRF wrapper around lookup_response: returns (cache_key, response), where the
+    response is a 304, the cached 200, or None when the view has to build the
+    data (then pass it to cache_response)
+    """
+    cache_key, not_modified, data = lookup_response(request, scopes, window, url)
+    if not_modified:
+        return cache_key, _with_headers(Response(status=status.HTTP_304_NOT_MODIFIED), cache_key)
+    if data is not None:
+        return cache_key, _with_headers(Response(data, status=status.HTTP_200_OK), cache_key)
+    return cache_key, None
+
+
+def cache_response(cache_key, data):
+    """
+    Store response data built for cache_key and return it as a 200 with its ETag
+    """
+    store_response(cache_key, data)
+    return _with_headers(Response(data, status=status.HTTP_200_OK), cache_key)
+
+
+def _bump_attendance(sender, document, **kwargs):
+    """Signal handler for Attendance writes"""
+    reference = document._data.get('employee')
+    bump_version(ATTENDANCE, employee_scope(getattr(reference, 'id', reference)))
+
+
+def connect_signals():
+    """
+    Bump the attendance version whenever an Attendance document is saved or deleted
+    Bulk writes that bypass signals bump it explicitly.
+    """
+    from .attendance_models import Attendance
+    signals.post_save.connect(_bump_attendance, sender=Attendance)
+    signals.post_delete.connect(_bump_attendance, sender=Attendance)
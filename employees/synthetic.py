@@ -0,0 +1,149 @@
+"""
+Synthetic employees and attendance for load tests and benchmarks
+
+Generation is deterministic for a given seed, so two runs of the same size
+produce the same data. Records are written with unordered insert_many batches
+straight to the collections, bypassing per-document validation.
+"""
+import random
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from . import attendance_monthly, attendance_summary
+from .attendance_models import Attendance, MonthlyAttendance, as_datetime
+from .models import Employee
+from .shared_cache import ATTENDANCE, EMPLOYEES, bump_version, employee_scope
+
+DEPARTMENTS = (
+    'Engineering', 'Sales', 'Marketing', 'Finance', 'Operations',
+    'Human Resources', 'Support', 'Legal', 'Product', 'Design',
+)
+# Most people are rarely absent and a few are often absent: each employee gets
+# an absence rate from Beta(2, 25) (mean ~7%), 1.3x higher on Mondays and Fridays
+ABSENCE_ALPHA = 2
+ABSENCE_BETA = 25
+LONG_WEEKEND_FACTOR = 1.3
+
+DEFAULT_PREFIX = 'SYN'
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _batched(documents, batch_size):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def employee_documents(count, rng, prefix=DEFAULT_PREFIX):
+    """
+    Raw employee documents: {prefix}000001.. spread over DEPARTMENTS
+    """
+    for i in range(1, count + 1):
+        yield {
+            'employeeId': f'{prefix}{i:06d}',
+            'full_name': f'Synthetic Employee {i}',
+            'email': f'{prefix.lower()}{i:06d}@example.com',
+            'department': rng.choice(DEPARTMENTS),
+        }
+
+
+def attendance_days(days, weekends=False, end=None):
+    """
+    The last `days` calendar days up to `end` (today), weekends skipped unless asked for
+    """
+    end = end or date.today()
+    for offset in range(days - 1, -1, -1):
+        day = end - timedelta(days=offset)
+        if weekends or day.weekday() < 5:
+            yield day
+
+
+def attendance_documents(employee_ids, days, rng, weekends=False):
+    """
+    Raw attendance documents, one per employee per day
+    """
+    created_at = datetime.utcnow()
+    days = list(attendance_days(days, weekends))
+    for employee_id in employee_ids:
+        absence_rate = rng.betavariate(ABSENCE_ALPHA, ABSENCE_BETA)
+        for day in days:
+            rate = absence_rate * (LONG_WEEKEND_FACTOR if day.weekday() in (0, 4) else 1)
+            yield {
+                'employee': employee_id,
+                'date': as_datetime(day),
+                'status': 'Absent' if rng.random() < rate else 'Present',
+                'created_at': created_at,
+            }
+
+
+def synthetic_employee_ids(prefix=DEFAULT_PREFIX):
+    """
+    ObjectIds of the employees a previous seed() created with this prefix
+    """
+    return [
+        row['_id'] for row in Employee._get_collection().find(
+            {'employeeId': {'$regex': f'^{prefix}[0-9]{{6}}$'}}, {'_id': 1}
+        )
+    ]
+
+
+def clear(prefix=DEFAULT_PREFIX):
+    """
+    Delete the synthetic employees with this prefix and their attendance; returns (employees, records)
+    """
+    employee_ids = synthetic_employee_ids(prefix)
+    if not employee_ids:
+        return 0, 0
+    records = Attendance._get_collection().delete_many({'employee': {'$in': employee_ids}}).deleted_count
+    MonthlyAttendance._get_collection().delete_many({'employee': {'$in': employee_ids}})
+    employees = Employee._get_collection().delete_many({'_id': {'$in': employee_ids}}).deleted_count
+    bump_version(EMPLOYEES, ATTENDANCE, *(employee_scope(employee_id) for employee_id in employee_ids))
+    attendance_summary.rebuild()
+    return employees, records
+
+
+def seed(employees, days, seed=42, prefix=DEFAULT_PREFIX, weekends=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Insert `employees` synthetic employees with `days` days of attendance each
+
+    Returns counts and timings. Fails with a duplicate key error if employees
+    with the same prefix already exist (see clear()).
+    """
+    rng = random.Random(seed)
+    Employee.ensure_indexes()
+    Attendance.ensure_indexes()
+
+    started = time.perf_counter()
+    departments = {}
+    for batch in _batched(employee_documents(employees, rng, prefix), batch_size):
+        Employee._get_collection().insert_many(batch, ordered=False)
+        departments.update((document['_id'], document['department']) for document in batch)
+    employees_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    records = absent = 0
+    daily = Counter()
+    for batch in _batched(attendance_documents(list(departments), days, rng, weekends), batch_size):
+        Attendance._get_collection().insert_many(batch, ordered=False)
+        records += len(batch)
+        absent += sum(1 for document in batch if document['status'] == 'Absent')
+        daily.update((document['date'], departments[document['employee']], document['status']) for document in batch)
+        attendance_monthly.apply_changes((document['employee'], document['date'], document['status']) for document in batch)
+    attendance_seconds = time.perf_counter() - started
+    attendance_summary.apply_changes((day, department, status, count) for (day, department, status), count in daily.items())
+
+    bump_version(EMPLOYEES, ATTENDANCE)
+    return {
+        'employees': len(departments),
+        'attendance': records,
+        'absent': absent,
+        'present': records - absent,
+        'employees_seconds': round(employees_seconds, 3),
+        'attendance_seconds': round(attendance_seconds, 3),
+    }
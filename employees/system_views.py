@@ -0,0 +1,40 @@
+"""
+Views for runtime diagnostics
+"""
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from employee_management.metrics import render_latest
+from employee_management.mongo import pool_stats
+from .employee_cache import employee_cache
+
+
+@api_view(['GET'])
+def system_stats(request):
+    """
+    Report in-process statistics for this worker
+    
+    GET /api/system/stats/ - Employee cache hit/miss counters and MongoDB pool usage
+    """
+    return Response({
+        'success': True,
+        'data': {
+            'employee_cache': employee_cache.stats(),
+            'mongo_pool': pool_stats.stats(),
+        }
+    }, status=status.HTTP_200_OK)
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus metrics for all workers
+
+    GET /api/metrics/ - Request counters and latency histograms per URL name,
+    MongoDB command latency and pool checkout waits (text exposition format).
+    A plain Django view: the response is not JSON.
+    """
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
@@ -1,18 +1,40 @@
 """
 URL configuration for employees app
 """
+from django.conf import settings
 from django.urls import path
 from . import views
 from . import attendance_views
+from . import analytics_views
+from . import async_views
+from . import system_views
+
+# ASYNC_VIEWS swaps the read endpoints for async versions (serve with uvicorn / ASGI)
+employee_read_views = async_views if settings.ASYNC_VIEWS else views
+attendance_read_views = async_views if settings.ASYNC_VIEWS else attendance_views
 
 urlpatterns = [
     # Employee endpoints
-    path('employees/', views.employee_list_create, name='employee-list-create'),
-    path('employees/<str:employee_id>/', views.employee_detail, name='employee-detail'),
+    path('employees/', employee_read_views.employee_list_create, name='employee-list-create'),
+    path('employees/import/', views.employee_import, name='employee-import'),
+    path('employees/<str:employee_id>/', employee_read_views.employee_detail, name='employee-detail'),
     path('employees/<str:employee_id>/update/', views.employee_partial_update, name='employee-partial-update'),
     
     # Attendance endpoints
-    path('attendance/', attendance_views.attendance_list_create, name='attendance-list-create'),
+    path('attendance/', attendance_read_views.attendance_list_create, name='attendance-list-create'),
+    path('attendance/bulk/', attendance_views.attendance_bulk_create, name='attendance-bulk-create'),
+    path('attendance/mark/', attendance_views.attendance_mark, name='attendance-mark'),
+    path('attendance/export/', attendance_views.attendance_export, name='attendance-export'),
+    path('attendance/summary/daily/', attendance_views.attendance_daily_summary, name='attendance-daily-summary'),
     path('attendance/<str:attendance_id>/', attendance_views.attendance_detail, name='attendance-detail'),
-    path('employees/<str:employee_id>/attendance/', attendance_views.employee_attendance, name='employee-attendance'),
+    path('employees/<str:employee_id>/attendance/', attendance_read_views.employee_attendance, name='employee-attendance'),
+    path('employees/<str:employee_id>/attendance/calendar/', attendance_views.employee_attendance_calendar, name='employee-attendance-calendar'),
+    
+    # Analytics endpoints
+    path('analytics/departments/', analytics_views.department_analytics, name='department-analytics'),
+    path('analytics/attendance-patterns/', analytics_views.attendance_patterns, name='attendance-patterns'),
+    
+    # Diagnostics
+    path('system/stats/', system_views.system_stats, name='system-stats'),
+    path('metrics/', system_views.metrics, name='metrics'),
 ]
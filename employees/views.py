@@ -1,13 +1,28 @@
 """
 Views for Employee API
 """
-from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from mongoengine.errors import DoesNotExist, ValidationError
+from bson import ObjectId
 from bson.errors import InvalidId
 from .models import Employee
-from .serializers import EmployeeSerializer
+from .serializers import EmployeeSerializer, employee_to_dict
+from .pagination import EMPLOYEE_ORDERING, PaginationError, page_metadata, paginate
+from .field_selection import (
+    EMPLOYEE_OUTPUT_FIELDS,
+    FieldSelectionError,
+    database_fields,
+    parse_fields,
+    select_fields,
+)
+from .employee_import import IMPORT_CONTENT_TYPES, format_from_filename, import_employees
+from .employee_cache import employee_cache
+from .shared_cache import EMPLOYEES, cache_response, cached_response, employee_scope
+from .read_preference import cache_window, read_preference
+from .attendance_summary import move_employee
 
 
 @api_view(['GET', 'POST'])
@@ -15,18 +30,45 @@ def employee_list_create(request):
     """
     List all employees or create a new employee
     
-    GET /api/employees/ - List all employees
+    GET /api/employees/ - List employees (paginated)
+    GET /api/employees/?limit=50&cursor=<next_cursor> - Fetch the next page
+    GET /api/employees/?fields=employeeId,full_name - Return only the listed fields
     POST /api/employees/ - Create a new employee
     """
     if request.method == 'GET':
         try:
-            employees = Employee.objects.all()
-            serializer = EmployeeSerializer(employees, many=True)
-            return Response({
+            try:
+                selection = parse_fields(request, EMPLOYEE_OUTPUT_FIELDS)
+            except FieldSelectionError as e:
+                return Response({
+                    'error': True,
+                    'message': 'Invalid fields parameter',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Repeated reads are served from the shared cache (or a 304) until the next write
+            cache_key, response = cached_response(request, (EMPLOYEES,), cache_window('employee_list'))
+            if response is not None:
+                return response
+            
+            # Read raw documents; building Employee objects costs more than the query
+            employees = Employee.objects.read_preference(read_preference('employee_list'))
+            employees = employees.only(*database_fields(selection, EMPLOYEE_OUTPUT_FIELDS)).as_pymongo()
+            try:
+                page, next_cursor = paginate(employees, request, EMPLOYEE_ORDERING)
+            except PaginationError as e:
+                return Response({
+                    'error': True,
+                    'message': 'Invalid pagination parameters',
+                    'details': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            data = [select_fields(employee_to_dict(son), selection) for son in page]
+            return cache_response(cache_key, {
                 'success': True,
-                'data': serializer.data,
-                'count': len(serializer.data)
-            }, status=status.HTTP_200_OK)
+                'data': data,
+                **page_metadata(request, data, next_cursor)
+            })
         except Exception as e:
             return Response({
                 'error': True,
@@ -50,6 +92,12 @@ def employee_list_create(request):
                     'message': 'Validation failed',
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
+        except serializers.ValidationError as e:
+            return Response({
+                'error': True,
+                'message': 'Validation failed',
+                'details': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({
                 'error': True,
@@ -64,15 +112,116 @@ def employee_list_create(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@parser_classes([MultiPartParser])
+def employee_import(request):
+    """
+    Bulk import employees from a CSV or NDJSON file
+    
+    POST /api/employees/import/ - Raw body with Content-Type text/csv or application/x-ndjson
+    POST /api/employees/import/ - multipart/form-data with a .csv/.ndjson/.jsonl file in "file"
+    """
+    content_type = request.content_type.split(';')[0].strip().lower()
+    if content_type == 'multipart/form-data':
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'error': True,
+                'message': 'Validation failed',
+                'details': 'Upload the file in a form field named "file"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        byte_lines = upload
+        file_format = format_from_filename(upload.name)
+    else:
+        # Read the raw request body line by line instead of buffering it
+        byte_lines = request.stream or []
+        file_format = IMPORT_CONTENT_TYPES.get(content_type)
+    
+    if file_format is None:
+        return Response({
+            'error': True,
+            'message': 'Unsupported import format',
+            'details': 'Send CSV (text/csv) or NDJSON (application/x-ndjson)'
+        }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    
+    try:
+        report = import_employees(byte_lines, file_format)
+        return Response({
+            'success': True,
+            'message': 'Employee import processed',
+            'data': report.as_dict()
+        }, status=status.HTTP_200_OK)
+    except UnicodeDecodeError as e:
+        return Response({
+            'error': True,
+            'message': 'Invalid file encoding',
+            'details': f'File must be UTF-8 encoded: {e}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': True,
+            'message': 'Failed to import employees',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET', 'PUT', 'DELETE'])
 def employee_detail(request, employee_id):
     """
     Retrieve, update or delete an employee
     
     GET /api/employees/<id>/ - Get employee details
+    GET /api/employees/<id>/?fields=employeeId,full_name - Return only the listed fields
     PUT /api/employees/<id>/ - Update employee
     DELETE /api/employees/<id>/ - Delete employee
     """
+    if request.method == 'GET':
+        try:
+            selection = parse_fields(request, EMPLOYEE_OUTPUT_FIELDS)
+        except FieldSelectionError as e:
+            return Response({
+                'error': True,
+                'message': 'Invalid fields parameter',
+                'details': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Full reads go through the employee cache, ?fields= reads fetch only the selected
+        # fields; writes below load the Document
+        try:
+            object_id = ObjectId(employee_id)
+            cache_key, response = cached_response(request, (employee_scope(object_id),))
+            if response is not None:
+                return response
+            
+            if selection is None:
+                employee = employee_cache.get_by_id(object_id)
+            else:
+                employee = Employee.objects(id=object_id).only(
+                    *database_fields(selection, EMPLOYEE_OUTPUT_FIELDS)
+                ).as_pymongo().first()
+            if not employee:
+                return Response({
+                    'error': True,
+                    'message': 'Employee not found',
+                    'details': f'No employee found with id: {employee_id}'
+                }, status=status.HTTP_404_NOT_FOUND)
+            return cache_response(cache_key, {
+                'success': True,
+                'data': select_fields(employee_to_dict(employee), selection)
+            })
+        except (InvalidId, TypeError) as e:
+            return Response({
+                'error': True,
+                'message': 'Invalid employee ID',
+                'details': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({
+                'error': True,
+                'message': 'Failed to retrieve employee',
+                'details': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
     try:
         employee = Employee.objects.get(id=employee_id)
     except (DoesNotExist, Employee.DoesNotExist):
@@ -94,21 +243,7 @@ def employee_detail(request, employee_id):
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-    if request.method == 'GET':
-        try:
-            serializer = EmployeeSerializer(employee)
-            return Response({
-                'success': True,
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
-        except Exception as e:
-            return Response({
-                'error': True,
-                'message': 'Failed to retrieve employee',
-                'details': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    elif request.method == 'PUT':
+    if request.method == 'PUT':
         try:
             serializer = EmployeeSerializer(employee, data=request.data, partial=False)
             if serializer.is_valid():
@@ -124,6 +259,12 @@ def employee_detail(request, employee_id):
                     'message': 'Validation failed',
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
+        except serializers.ValidationError as e:
+            return Response({
+                'error': True,
+                'message': 'Validation failed',
+                'details': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
         except ValueError as e:
             return Response({
                 'error': True,
@@ -140,6 +281,8 @@ def employee_detail(request, employee_id):
     elif request.method == 'DELETE':
         try:
             employee.delete()
+            # Attendance of deleted employees no longer counts in the daily summary
+            move_employee(employee.pk, employee.department)
             return Response({
                 'success': True,
                 'message': 'Employee deleted successfully'
@@ -195,6 +338,12 @@ def employee_partial_update(request, employee_id):
                 'message': 'Validation failed',
                 'details': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
+    except serializers.ValidationError as e:
+        return Response({
+            'error': True,
+            'message': 'Validation failed',
+            'details': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
     except ValueError as e:
         return Response({
             'error': True,
@@ -0,0 +1,65 @@
+"""
+gunicorn settings
+
+    gunicorn employee_management.wsgi:application -c gunicorn.conf.py
+
+Keep MONGODB_MAX_POOL_SIZE at or above GUNICORN_THREADS (it defaults to it):
+each worker has its own pool and runs at most one query per thread.
+"""
+import glob
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# The app (and its MongoDB client) is loaded in each worker after the fork;
+# a client created in the master would be shared unsafely by every worker
+preload_app = False
+
+# Prometheus multiprocess mode: workers write metrics here and /api/metrics/ merges
+# them. Set before any worker imports prometheus_client (see employee_management/metrics.py).
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/employee_management_metrics')
+
+
+def on_starting(server):
+    """
+    Refuse a per-process cache with several workers, and start without metric files
+
+    Cache versions and cached responses must be shared by all workers, or a
+    write on one worker leaves the others serving stale data. Metric files
+    from a previous run would be merged in; only the *.db files
+    prometheus_client writes are removed, in case the variable points at a
+    directory that holds anything else.
+    """
+    if server.cfg.workers > 1 and os.environ.get('CACHE_BACKEND') == 'locmem':
+        raise RuntimeError(
+            f'CACHE_BACKEND=locmem is per process and cannot be used with {server.cfg.workers} workers; '
+            'use file or redis (or WEB_CONCURRENCY=1)'
+        )
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.remove(path)
+
+
+def post_worker_init(worker):
+    """
+    Optionally open the MongoDB pool before the worker takes requests
+    (MONGODB_CONNECT_ON_BOOT=1); by default it opens on the first query
+    """
+    if os.environ.get('MONGODB_CONNECT_ON_BOOT', '').lower() not in ('1', 'true', 'yes'):
+        return
+    from employee_management.mongo import warm_up
+    try:
+        warm_up()
+    except Exception as e:
+        worker.log.warning('MongoDB warm-up failed: %s', e)
+
+
+def child_exit(server, worker):
+    """
+    Drop the exited worker's live gauges (its counters and histograms are kept)
+    """
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,329 @@
+"""
+Load test: concurrent clients replaying a weighted mix of the calls in
+test_api.py / test_attendance_api.py, reporting throughput and latency
+percentiles per endpoint. Writes go to the target database, so point it at a
+local server with seeded data:
+
+    python manage.py seed_synthetic --employees 5000 --days 30
+    gunicorn employee_management.wsgi:application -c gunicorn.conf.py
+    python load_test.py --url http://127.0.0.1:8000 --concurrency 32 --duration 60
+
+--mix overrides operation weights, e.g. --mix mark_attendance=50,get_all_attendance=10
+(unlisted operations keep their default weight; 0 disables one). --json writes
+the results to a file for comparison between runs. --timeout bounds every
+request, so a stalled server shows up as ReadTimeout errors instead of hung clients.
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+import requests
+
+# Weights loosely model the morning peak: mostly attendance marking and reads
+DEFAULT_MIX = {
+    'get_all_employees': 5,
+    'get_employee': 10,
+    'create_employee': 1,
+    'update_employee': 1,
+    'partial_update_employee': 2,
+    'delete_employee': 1,
+    'mark_attendance': 30,
+    'upsert_attendance': 15,
+    'get_all_attendance': 5,
+    'get_attendance_by_employee': 8,
+    'get_attendance_by_date': 5,
+    'get_employee_attendance': 10,
+    'get_employee_attendance_date_range': 5,
+    'update_attendance': 2,
+}
+
+
+class TimeoutSession(requests.Session):
+    """
+    Session whose requests time out after `timeout` seconds unless a call passes its own
+    """
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class Target:
+    """
+    Employees and attendance records discovered on the server, plus the
+    employees this run created (so deletes never touch seeded data)
+    """
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.run_id = f'{int(time.time()) % 100000:05d}'
+        self.counter = itertools.count()
+        self.created = []
+        self.lock = threading.Lock()
+
+        response = requests.get(f'{base_url}/api/employees/?limit=1000&fields=id,employeeId', timeout=timeout)
+        response.raise_for_status()
+        self.employees = response.json()['data']
+        if not self.employees:
+            raise SystemExit('No employees found; seed some first (python manage.py seed_synthetic)')
+        response = requests.get(
+            f'{base_url}/api/attendance/?limit=1000&fields=id,employee.employeeId,date', timeout=timeout
+        )
+        response.raise_for_status()
+        self.attendance = response.json()['data']
+
+    def new_employee(self):
+        n = next(self.counter)
+        return {
+            'employeeId': f'LOAD{self.run_id}{n:06d}',
+            'full_name': f'Load Test {n}',
+            'email': f'load{self.run_id}{n:06d}@example.com',
+            'department': random.choice(('Engineering', 'Sales', 'Support')),
+        }
+
+
+def op_get_all_employees(session, target):
+    return session.get(f'{target.base_url}/api/employees/')
+
+
+def op_get_employee(session, target):
+    return session.get(f"{target.base_url}/api/employees/{random.choice(target.employees)['id']}/")
+
+
+def op_create_employee(session, target):
+    response = session.post(f'{target.base_url}/api/employees/', json=target.new_employee())
+    if response.status_code == 201:
+        with target.lock:
+            target.created.append(response.json()['data']['id'])
+    return response
+
+
+def op_update_employee(session, target):
+    with target.lock:
+        employee_id = random.choice(target.created) if target.created else None
+    if employee_id is None:
+        return op_create_employee(session, target)
+    return session.put(f'{target.base_url}/api/employees/{employee_id}/', json=target.new_employee())
+
+
+def op_partial_update_employee(session, target):
+    employee = random.choice(target.employees)
+    return session.patch(
+        f"{target.base_url}/api/employees/{employee['id']}/update/",
+        json={'department': random.choice(('Engineering', 'Sales', 'Support'))}
+    )
+
+
+def op_delete_employee(session, target):
+    with target.lock:
+        employee_id = target.created.pop() if target.created else None
+    if employee_id is None:
+        return op_create_employee(session, target)
+    return session.delete(f'{target.base_url}/api/employees/{employee_id}/')
+
+
+def op_mark_attendance(session, target):
+    # POST like test_attendance_api.py; a second mark for the same day is a 400
+    return session.post(f'{target.base_url}/api/attendance/', json={
+        'employeeId': random.choice(target.employees)['employeeId'],
+        'date': str(date.today()),
+        'status': 'Present' if random.random() < 0.93 else 'Absent',
+    })
+
+
+def op_upsert_attendance(session, target):
+    return session.put(f'{target.base_url}/api/attendance/mark/', json={
+        'employeeId': random.choice(target.employees)['employeeId'],
+        'date': str(date.today()),
+        'status': 'Present' if random.random() < 0.93 else 'Absent',
+    })
+
+
+def op_get_all_attendance(session, target):
+    return session.get(f'{target.base_url}/api/attendance/')
+
+
+def op_get_attendance_by_employee(session, target):
+    return session.get(f"{target.base_url}/api/attendance/?employeeId={random.choice(target.employees)['employeeId']}")
+
+
+def op_get_attendance_by_date(session, target):
+    day = date.today() - timedelta(days=random.randrange(30))
+    return session.get(f'{target.base_url}/api/attendance/?date={day}')
+
+
+def op_get_employee_attendance(session, target):
+    return session.get(f"{target.base_url}/api/employees/{random.choice(target.employees)['employeeId']}/attendance/")
+
+
+def op_get_employee_attendance_date_range(session, target):
+    employee_id = random.choice(target.employees)['employeeId']
+    end = date.today()
+    return session.get(
+        f'{target.base_url}/api/employees/{employee_id}/attendance/?start_date={end - timedelta(days=7)}&end_date={end}'
+    )
+
+
+def op_update_attendance(session, target):
+    if not target.attendance:
+        return op_get_all_attendance(session, target)
+    record = random.choice(target.attendance)
+    return session.put(f"{target.base_url}/api/attendance/{record['id']}/", json={
+        'employeeId': record['employee']['employeeId'],
+        'date': record['date'],
+        'status': random.choice(('Present', 'Absent')),
+    })
+
+
+OPERATIONS = {name: globals()[f'op_{name}'] for name in DEFAULT_MIX}
+
+
+def parse_mix(value):
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, (value or '').split(',')):
+        name, separator, weight = item.partition('=')
+        if not separator:
+            raise SystemExit(f'Invalid --mix item {item!r}; expected operation=weight')
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation {name!r}; choose from: {', '.join(OPERATIONS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise SystemExit(f'Invalid weight {weight!r} for {name}; expected a number')
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    if not mix:
+        raise SystemExit('Every operation has weight 0')
+    return mix
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def run(target, mix, concurrency, duration, warmup, timeout):
+    """
+    Run `concurrency` clients for warmup + duration seconds; only the last
+    `duration` seconds are recorded. Every request times out after `timeout`
+    seconds. Returns (samples, measured seconds).
+    """
+    names, weights = list(mix), list(mix.values())
+    samples = defaultdict(list)  # operation -> [(seconds, status or exception name)]
+    lock = threading.Lock()
+    started = time.monotonic()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    def client():
+        session = TimeoutSession(timeout)
+        local = defaultdict(list)
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            name = random.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            try:
+                outcome = OPERATIONS[name](session, target).status_code
+            except requests.RequestException as e:
+                outcome = type(e).__name__
+            elapsed = time.perf_counter() - request_started
+            if now >= measure_from:
+                local[name].append((elapsed, outcome))
+        with lock:
+            for name, results in local.items():
+                samples[name].extend(results)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.monotonic() - measure_from
+
+
+def is_error(outcome):
+    """5xx responses and connection failures; 4xx (e.g. duplicate marks) are expected"""
+    return not outcome.isdigit() or int(outcome) >= 500
+
+
+def summarize(samples, seconds):
+    results = {}
+    for name, entries in sorted(samples.items()):
+        latencies = [elapsed * 1000 for elapsed, _ in entries]
+        outcomes = Counter(str(outcome) for _, outcome in entries)
+        results[name] = {
+            'requests': len(entries),
+            'rps': round(len(entries) / seconds, 2),
+            'errors': sum(count for outcome, count in outcomes.items() if is_error(outcome)),
+            'statuses': dict(sorted(outcomes.items())),
+            'ms': {
+                'p50': round(percentile(latencies, 0.50), 2),
+                'p95': round(percentile(latencies, 0.95), 2),
+                'p99': round(percentile(latencies, 0.99), 2),
+                'max': round(max(latencies), 2),
+                'mean': round(sum(latencies) / len(latencies), 2),
+            },
+        }
+    return results
+
+
+def print_report(results, seconds, concurrency):
+    total = sum(result['requests'] for result in results.values())
+    errors = sum(result['errors'] for result in results.values())
+    print(f"\n{concurrency} clients, {seconds:.1f}s: {total} requests, {total / seconds:.1f} req/s, {errors} errors")
+    print(f"{'operation':<36} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+    for name, result in results.items():
+        ms = result['ms']
+        statuses = ' '.join(f'{status}:{count}' for status, count in result['statuses'].items())
+        print(
+            f"{name:<36} {result['requests']:>7} {result['rps']:>8.1f} {ms['p50']:>8.1f} {ms['p95']:>8.1f} "
+            f"{ms['p99']:>8.1f} {ms['max']:>8.1f}  {statuses}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients (default 16)')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds (default 30)')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured seconds first (default 5)')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds before a request fails (default 10)')
+    parser.add_argument('--mix', help='Comma-separated operation=weight overrides')
+    parser.add_argument('--seed', type=int, help='Random seed for the operation sequence')
+    parser.add_argument('--json', help='Write the results to this file')
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    mix = parse_mix(args.mix)
+    target = Target(args.url.rstrip('/'), args.timeout)
+    samples, seconds = run(target, mix, args.concurrency, args.duration, args.warmup, args.timeout)
+    results = summarize(samples, seconds)
+    print_report(results, seconds, args.concurrency)
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump({
+                'url': target.base_url,
+                'concurrency': args.concurrency,
+                'seconds': round(seconds, 3),
+                'mix': mix,
+                'operations': results,
+            }, output, indent=2)
+    return 0 if all(result['errors'] == 0 for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
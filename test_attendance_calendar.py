@@ -0,0 +1,36 @@
+"""
+Attendance calendar encoding tests (no database needed):
+
+    python -m pytest test_attendance_calendar.py
+"""
+import os
+from datetime import date, datetime
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees.attendance_monthly import marked_days  # noqa: E402
+from employees.attendance_views import calendar_string  # noqa: E402
+
+
+def test_calendar_string():
+    days = calendar_string([(date(2024, 1, 1), 'Present'), (date(2024, 12, 31), 'Absent')], 2024)
+    assert len(days) == 366
+    assert days[0] == 'P' and days[-1] == 'A'
+    assert set(days[1:-1]) == {'-'}
+    assert len(calendar_string([], 2023)) == 365
+
+
+def test_calendar_string_from_month_documents():
+    documents = [{'month': datetime(2023, 3, 1), 'present': 0b1, 'absent': 0}]
+    days = calendar_string(marked_days(documents), 2023)
+    assert days[31 + 28] == 'P'  # March 1st
+    assert days.count('P') == 1 and days.count('A') == 0
+
+
+if __name__ == "__main__":
+    test_calendar_string()
+    test_calendar_string_from_month_documents()
+    print("✓ Attendance calendar OK")
@@ -0,0 +1,112 @@
+"""
+Monthly attendance bitmask tests (no database needed; the collection is mocked):
+
+    python -m pytest test_attendance_monthly.py
+"""
+import os
+from datetime import date, datetime
+from unittest import mock
+
+import django
+from bson import ObjectId
+from django.test import override_settings
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees import attendance_monthly  # noqa: E402
+from employees.attendance_models import MonthlyAttendance  # noqa: E402
+
+
+def monthly_updates(changes):
+    """(filter, update) of every operation apply_changes() sends, in order"""
+    collection = mock.Mock()
+    with override_settings(ATTENDANCE_STORAGE_MODE='dual'), \
+            mock.patch.object(MonthlyAttendance, '_get_collection', return_value=collection):
+        attendance_monthly.apply_changes(changes)
+    if not collection.bulk_write.called:
+        return []
+    return [(operation._filter, operation._doc) for operation in collection.bulk_write.call_args[0][0]]
+
+
+def test_monthly_set_day_is_one_update():
+    employee_id = ObjectId()
+    [(key, update)] = monthly_updates([(employee_id, date(2024, 3, 3), 'Present')])
+    assert key == {'employee': employee_id, 'month': datetime(2024, 3, 1)}
+    assert update == {'$bit': {'present': {'or': 0b100}, 'absent': {'and': ~0b100}}}
+
+
+def test_monthly_clear_day_clears_both_masks():
+    [(_, update)] = monthly_updates([(ObjectId(), date(2024, 3, 1), None)])
+    assert update == {'$bit': {'present': {'and': ~1}, 'absent': {'and': ~1}}}
+
+
+def test_monthly_later_change_to_a_day_wins():
+    employee_id = ObjectId()
+    [(_, update)] = monthly_updates([
+        (employee_id, date(2024, 3, 2), 'Present'),
+        (employee_id, date(2024, 3, 2), 'Absent'),
+    ])
+    assert update == {'$bit': {'present': {'and': ~0b10}, 'absent': {'or': 0b10}}}
+
+
+def test_monthly_set_and_clear_in_one_mask_is_two_updates():
+    employee_id = ObjectId()
+    updates = monthly_updates([
+        (employee_id, date(2024, 3, 1), 'Present'),
+        (employee_id, date(2024, 3, 2), 'Absent'),
+    ])
+    assert [update for _, update in updates] == [
+        {'$bit': {'present': {'and': ~0b10}, 'absent': {'and': ~0b1}}},
+        {'$bit': {'present': {'or': 0b1}, 'absent': {'or': 0b10}}},
+    ]
+
+
+def test_monthly_changes_group_by_employee_and_month():
+    first, second = ObjectId(), ObjectId()
+    updates = monthly_updates([
+        (first, date(2024, 1, 31), 'Present'),
+        (first, date(2024, 2, 1), 'Present'),
+        (second, date(2024, 1, 31), 'Absent'),
+    ])
+    assert [key for key, _ in updates] == [
+        {'employee': first, 'month': datetime(2024, 1, 1)},
+        {'employee': first, 'month': datetime(2024, 2, 1)},
+        {'employee': second, 'month': datetime(2024, 1, 1)},
+    ]
+
+
+def test_monthly_changes_are_skipped_in_rows_mode():
+    collection = mock.Mock()
+    with override_settings(ATTENDANCE_STORAGE_MODE='rows'), \
+            mock.patch.object(MonthlyAttendance, '_get_collection', return_value=collection):
+        attendance_monthly.apply_changes([(ObjectId(), date(2024, 3, 1), 'Present')])
+    assert not collection.method_calls
+
+
+def test_marked_days_newest_first_within_range():
+    documents = [
+        {'month': datetime(2024, 2, 1), 'present': 0b1, 'absent': 0b100},
+        {'month': datetime(2024, 1, 1), 'present': 1 << 30, 'absent': 0b1},
+    ]
+    days = list(attendance_monthly.marked_days(documents, date(2024, 1, 2), date(2024, 2, 29)))
+    assert days == [(date(2024, 2, 3), 'Absent'), (date(2024, 2, 1), 'Present'), (date(2024, 1, 31), 'Present')]
+    assert attendance_monthly.statistics(days) == {'total': 3, 'present': 2, 'absent': 1}
+
+
+def test_covers_only_record_fields_months_provide():
+    assert attendance_monthly.covers({'date': None, 'status': None})
+    assert not attendance_monthly.covers({'id': None, 'date': None})
+    assert not attendance_monthly.covers(None)
+
+
+if __name__ == "__main__":
+    test_monthly_set_day_is_one_update()
+    test_monthly_clear_day_clears_both_masks()
+    test_monthly_later_change_to_a_day_wins()
+    test_monthly_set_and_clear_in_one_mask_is_two_updates()
+    test_monthly_changes_group_by_employee_and_month()
+    test_monthly_changes_are_skipped_in_rows_mode()
+    test_marked_days_newest_first_within_range()
+    test_covers_only_record_fields_months_provide()
+    print("✓ Monthly attendance OK")
@@ -0,0 +1,102 @@
+"""
+Attendance pattern tests on in-memory matrices and month documents (no database needed):
+
+    python -m pytest test_attendance_patterns.py
+"""
+import os
+from datetime import date, datetime
+
+import django
+import numpy as np
+from bson import ObjectId
+from django.test import override_settings
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees import attendance_patterns  # noqa: E402
+
+P, A, U = attendance_patterns.PRESENT, attendance_patterns.ABSENT, attendance_patterns.UNMARKED
+
+
+def test_matrix_from_months_stops_at_month_end():
+    # February 2023 has 28 days; its block must not overwrite March 1st whatever the order
+    employee_id = ObjectId()
+    documents = [
+        {'employee': employee_id, 'month': datetime(2023, 3, 1), 'present': 0b1, 'absent': 0},
+        {'employee': employee_id, 'month': datetime(2023, 2, 1), 'present': 0, 'absent': 1 << 27},
+    ]
+    start = date(2023, 2, 1)
+    for ordered in (documents, documents[::-1]):
+        codes = attendance_patterns.matrix_from_months(ordered, {employee_id: 0}, start, 59)
+        assert codes[0, 27] == A  # February 28th
+        assert codes[0, 28] == P  # March 1st
+        assert (codes[0] != U).sum() == 2
+
+
+def test_matrix_from_months_clips_to_the_range():
+    employee_id, other = ObjectId(), ObjectId()
+    documents = [
+        {'employee': employee_id, 'month': datetime(2024, 1, 1), 'present': (1 << 31) - 1, 'absent': 0},
+        {'employee': other, 'month': datetime(2024, 1, 1), 'present': 1, 'absent': 0},
+    ]
+    codes = attendance_patterns.matrix_from_months(documents, {employee_id: 0}, date(2024, 1, 10), 5)
+    assert codes.tolist() == [[P] * 5]
+
+
+@override_settings(ATTENDANCE_PATTERN_WINDOW_DAYS=4)
+def test_compute_streaks_and_rolling_rates():
+    codes = np.array([
+        [P, A, U, A, A, P, A, P],
+        [U, U, U, U, U, U, U, U],
+    ], dtype=np.int8)
+    metrics = attendance_patterns.compute(codes, date(2024, 1, 1))
+
+    # Unmarked days neither extend nor break a streak
+    assert metrics['longest_absence_streak'].tolist() == [3, 0]
+    assert metrics['present'].tolist() == [3, 0]
+    assert metrics['absent'].tolist() == [4, 0]
+    # Last 4 days: A, P, A, P; lowest window: A, U, A, A
+    assert metrics['rolling_rate'][0] == 50
+    assert metrics['lowest_rolling_rate'][0] == 0
+    assert np.isnan(metrics['attendance_rate'][1])
+
+
+def test_compute_flags_frequent_monday_absences():
+    start = date(2024, 1, 1)  # a Monday
+    days = 7 * 20
+    mondays = (start.weekday() + np.arange(days)) % 7 == 0
+    weekdays = (start.weekday() + np.arange(days)) % 7 < 5
+    codes = np.where(weekdays, P, U).astype(np.int8)[None, :].repeat(2, axis=0)
+    codes[0, mondays] = A  # absent every Monday, never otherwise
+    codes[1, np.flatnonzero(weekdays)[::7]] = A  # every 7th weekday, so spread over the week
+
+    metrics = attendance_patterns.compute(codes, start)
+    assert metrics['frequent_monday_absences'].tolist() == [True, False]
+    assert metrics['monday_absences'][0] == 20
+    assert metrics['monday_absence_rate'][0] == 100
+    assert metrics['other_absence_rate'][0] == 0
+
+
+def test_compute_needs_other_days_to_flag_mondays():
+    # Monday absences with nothing else marked have no baseline to compare against
+    start = date(2024, 1, 1)  # a Monday
+    days = 7 * 10
+    mondays = (start.weekday() + np.arange(days)) % 7 == 0
+    codes = np.full((3, days), U, dtype=np.int8)
+    codes[:, mondays] = A
+    codes[1, np.flatnonzero(~mondays)[:3]] = P  # too few other days
+    codes[2, np.flatnonzero(~mondays)[:20]] = P  # enough other days
+
+    metrics = attendance_patterns.compute(codes, start)
+    assert metrics['frequent_monday_absences'].tolist() == [False, False, True]
+    assert np.isnan(metrics['other_absence_rate'][0])
+
+
+if __name__ == "__main__":
+    test_matrix_from_months_stops_at_month_end()
+    test_matrix_from_months_clips_to_the_range()
+    test_compute_streaks_and_rolling_rates()
+    test_compute_flags_frequent_monday_absences()
+    test_compute_needs_other_days_to_flag_mondays()
+    print("✓ Attendance patterns OK")
@@ -0,0 +1,185 @@
+"""
+Query count test for attendance list endpoints
+Run against a local MongoDB (a throwaway database is created and dropped):
+
+    MONGODB_TEST_HOST=mongodb://localhost:27017 python -m pytest test_attendance_queries.py
+"""
+import os
+from datetime import date, timedelta
+
+import django
+import mongoengine
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from rest_framework.test import APIClient  # noqa: E402
+from employees.models import Employee  # noqa: E402
+from employees.attendance_models import Attendance  # noqa: E402
+from employees.employee_cache import employee_cache  # noqa: E402
+from employees.shared_cache import get_cache  # noqa: E402
+from employee_management.timing import command_timing  # noqa: E402
+
+TEST_HOST = os.environ.get('MONGODB_TEST_HOST', 'mongodb://localhost:27017')
+TEST_DB = 'employee_db_query_test'
+EMPLOYEES = 100
+DAYS = 10
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Collects (command name, collection) for every command sent to MongoDB"""
+
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        self.commands.append((event.command_name, event.command.get(event.command_name)))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def count(self, command_name, collection=None):
+        return sum(
+            1 for name, target in self.commands
+            if name == command_name and (collection is None or target == collection)
+        )
+
+
+counter = CommandCounter()
+
+
+def clear_caches():
+    employee_cache.clear()
+    get_cache().clear()
+
+
+def server_available():
+    """True when a MongoDB server answers at TEST_HOST within a second"""
+    client = MongoClient(TEST_HOST, serverSelectionTimeoutMS=1000)
+    try:
+        client.server_info()
+        return True
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+
+
+def setup_module(module):
+    if not server_available():
+        import pytest
+        pytest.skip(f'No MongoDB server reachable at {TEST_HOST}', allow_module_level=True)
+    mongoengine.disconnect()
+    mongoengine.connect(db=TEST_DB, host=TEST_HOST, event_listeners=[counter, command_timing])
+    employees = Employee.objects.insert([
+        Employee(employeeId=f'Q{i:04d}', full_name=f'Query Test {i}', email=f'q{i}@example.com')
+        for i in range(EMPLOYEES)
+    ])
+    start = date.today() - timedelta(days=DAYS)
+    Attendance.objects.insert([
+        Attendance(employee=employee, date=start + timedelta(days=day), status='Present')
+        for employee in employees
+        for day in range(DAYS)
+    ])
+
+
+def teardown_module(module):
+    mongoengine.connection.get_connection().drop_database(TEST_DB)
+    mongoengine.disconnect()
+
+
+def test_attendance_page_resolves_employees_in_one_query():
+    """A 1,000-row page costs one attendance find and one employees find"""
+    clear_caches()
+    counter.commands.clear()
+    response = APIClient().get('/api/attendance/?limit=1000')
+
+    assert response.status_code == 200
+    assert response.json()['count'] == EMPLOYEES * DAYS
+    assert counter.count('find', 'attendance') == 1
+    assert counter.count('find', 'employees') == 1
+
+
+def test_employee_attendance_does_not_dereference_per_row():
+    """The employee is looked up once; rows reuse it"""
+    clear_caches()
+    counter.commands.clear()
+    response = APIClient().get('/api/employees/Q0001/attendance/')
+
+    assert response.status_code == 200
+    assert response.json()['count'] == DAYS
+    assert counter.count('find', 'employees') == 1
+
+
+def test_cached_employees_cost_no_queries():
+    """A warm employee cache serves the whole page's employee block"""
+    APIClient().get('/api/attendance/?limit=1000')
+    counter.commands.clear()
+    # A different URL misses the response cache but not the employee cache
+    response = APIClient().get('/api/attendance/?limit=999')
+
+    assert response.status_code == 200
+    assert counter.count('find', 'attendance') == 1
+    assert counter.count('find', 'employees') == 0
+
+
+def test_cached_response_costs_no_queries_until_a_write():
+    """A repeated list request is served from the shared cache; a write invalidates it"""
+    client = APIClient()
+    first = client.get('/api/attendance/?limit=10').json()
+    counter.commands.clear()
+    assert client.get('/api/attendance/?limit=10').json() == first
+    assert counter.commands == []
+
+    client.put('/api/attendance/mark/', {
+        'employeeId': 'Q0000', 'date': first['data'][0]['date'], 'status': 'Absent'
+    }, format='json')
+    counter.commands.clear()
+    response = client.get('/api/attendance/?limit=10')
+
+    assert counter.count('find', 'attendance') == 1
+    assert response.json()['count'] == 10
+
+
+def test_matching_etag_returns_304_without_queries():
+    """A polling client with the current ETag gets an empty 304"""
+    client = APIClient()
+    etag = client.get('/api/employees/Q0002/attendance/')['ETag']
+    counter.commands.clear()
+    response = client.get('/api/employees/Q0002/attendance/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert counter.commands == []
+
+
+def test_server_timing_counts_the_request_commands():
+    """The Server-Timing db entry reports the commands the request issued"""
+    clear_caches()
+    counter.commands.clear()
+    response = APIClient().get('/api/attendance/?limit=1000')
+    metrics = dict(entry.strip().split(';', 1) for entry in response['Server-Timing'].split(','))
+
+    assert f'desc="{len(counter.commands)} commands"' in metrics['db']
+    assert {'db', 'serialize', 'total'} == set(metrics)
+
+
+if __name__ == "__main__":
+    if not server_available():
+        raise SystemExit(f'No MongoDB server reachable at {TEST_HOST}')
+    setup_module(None)
+    try:
+        test_attendance_page_resolves_employees_in_one_query()
+        test_employee_attendance_does_not_dereference_per_row()
+        test_cached_employees_cost_no_queries()
+        test_cached_response_costs_no_queries_until_a_write()
+        test_matching_etag_returns_304_without_queries()
+        test_server_timing_counts_the_request_commands()
+        print("✓ Attendance query counts OK")
+    finally:
+        teardown_module(None)
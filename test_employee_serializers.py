@@ -0,0 +1,64 @@
+"""
+Duplicate key handling tests for employee writes (no database needed):
+
+    python -m pytest test_employee_serializers.py
+"""
+import os
+from unittest import mock
+
+import django
+from mongoengine.errors import NotUniqueError
+from rest_framework import serializers
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees.serializers import DUPLICATE_ERRORS, duplicate_field, save_employee  # noqa: E402
+
+# Server messages as MongoDB (E11000) and MongoEngine (NotUniqueError) word them
+EMAIL_ERROR = (
+    'E11000 duplicate key error collection: employee_db.employees index: email_1 '
+    'dup key: { email: "jane@example.com" }'
+)
+EMPLOYEE_ID_ERROR = (
+    'Tried to save duplicate unique keys (E11000 duplicate key error collection: '
+    'employee_db.employees index: employeeId_1 dup key: { employeeId: "EMP001" }, full error: {})'
+)
+
+
+def test_duplicate_field_reads_the_index_name():
+    assert duplicate_field(EMAIL_ERROR) == 'email'
+    assert duplicate_field(NotUniqueError(EMPLOYEE_ID_ERROR)) == 'employeeId'
+
+
+def test_duplicate_field_ignores_field_names_in_the_value():
+    error = (
+        'E11000 duplicate key error collection: employee_db.employees index: email_1 '
+        'dup key: { email: "employeeId_1@example.com" }'
+    )
+    assert duplicate_field(error) == 'email'
+
+
+def test_duplicate_field_falls_back_without_an_index_name():
+    assert duplicate_field('E11000 duplicate key error dup key: { employeeId: "EMP001" }') == 'employeeId'
+    assert duplicate_field('E11000 duplicate key error') == 'email'
+
+
+def test_save_employee_maps_duplicates_to_field_errors():
+    employee = mock.Mock()
+    employee.save.side_effect = NotUniqueError(EMPLOYEE_ID_ERROR)
+    try:
+        save_employee(employee)
+    except serializers.ValidationError as e:
+        assert e.detail == {'employeeId': DUPLICATE_ERRORS['employeeId']}
+    else:
+        raise AssertionError('duplicate was not reported')
+    employee.save.assert_called_once_with(validate=False)
+
+
+if __name__ == "__main__":
+    test_duplicate_field_reads_the_index_name()
+    test_duplicate_field_ignores_field_names_in_the_value()
+    test_duplicate_field_falls_back_without_an_index_name()
+    test_save_employee_maps_duplicates_to_field_errors()
+    print("✓ Employee duplicate handling OK")
@@ -0,0 +1,67 @@
+"""
+Cursor pagination tests (no database needed):
+
+    python -m pytest test_pagination.py
+"""
+import base64
+import os
+from datetime import datetime
+
+import django
+from bson import ObjectId
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees.pagination import (  # noqa: E402
+    ATTENDANCE_ORDERING,
+    EMPLOYEE_ORDERING,
+    PaginationError,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def raw_cursor(text):
+    """A cursor token for arbitrary extended JSON text"""
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def assert_invalid_cursor(token, ordering):
+    try:
+        decode_cursor(token, ordering)
+    except PaginationError as e:
+        assert str(e) == 'Invalid cursor'
+    else:
+        raise AssertionError(f'cursor {token!r} was accepted')
+
+
+def test_cursor_round_trip():
+    values = [datetime(2024, 1, 31), None, ObjectId()]
+    assert decode_cursor(encode_cursor(values), ATTENDANCE_ORDERING) == values
+
+
+def test_cursor_rejects_other_value_types():
+    assert_invalid_cursor(encode_cursor([{'$ne': None}]), EMPLOYEE_ORDERING)
+    assert_invalid_cursor(encode_cursor(['507f1f77bcf86cd799439011']), EMPLOYEE_ORDERING)
+    assert_invalid_cursor(encode_cursor([1]), EMPLOYEE_ORDERING)
+
+
+def test_cursor_rejects_malformed_tokens():
+    assert_invalid_cursor('not a cursor', EMPLOYEE_ORDERING)
+    assert_invalid_cursor(encode_cursor({'_id': ObjectId()}), EMPLOYEE_ORDERING)
+    assert_invalid_cursor(encode_cursor([ObjectId()]), ATTENDANCE_ORDERING)
+
+
+def test_cursor_rejects_malformed_extended_json():
+    assert_invalid_cursor(raw_cursor('[{"$oid": "zz"}]'), EMPLOYEE_ORDERING)
+    assert_invalid_cursor(raw_cursor('[{"$date": 1e400}]'), EMPLOYEE_ORDERING)
+    assert_invalid_cursor(raw_cursor('[{"$date": {"$numberLong": "99999999999999999999"}}]'), EMPLOYEE_ORDERING)
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_cursor_rejects_other_value_types()
+    test_cursor_rejects_malformed_tokens()
+    test_cursor_rejects_malformed_extended_json()
+    print("✓ Cursor pagination OK")
@@ -0,0 +1,147 @@
+"""
+Read preference routing test
+Run against a local single-node replica set (a throwaway database is created and dropped):
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 &
+    mongosh --eval 'rs.initiate()'
+    MONGODB_TEST_HOST=mongodb://localhost:27017/?replicaSet=rs0 python -m pytest test_read_preference.py
+
+With one member, secondaryPreferred falls back to the primary, so the test
+checks the read preference each command carries rather than where it ran.
+"""
+import os
+from datetime import date
+
+import django
+import mongoengine
+from django.test import override_settings
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from rest_framework.test import APIClient  # noqa: E402
+from employees.models import Employee  # noqa: E402
+from employees.attendance_models import Attendance  # noqa: E402
+from employees.employee_cache import employee_cache  # noqa: E402
+from employees.shared_cache import get_cache  # noqa: E402
+
+TEST_HOST = os.environ.get('MONGODB_TEST_HOST', 'mongodb://localhost:27017/?replicaSet=rs0')
+TEST_DB = 'employee_db_read_preference_test'
+SECONDARY_READS = {
+    'employee_list': 'secondaryPreferred',
+    'attendance_list': 'secondaryPreferred',
+    'employee_attendance': 'secondaryPreferred',
+    'attendance_export': 'secondaryPreferred',
+}
+
+
+class ReadModeRecorder(monitoring.CommandListener):
+    """Collects (command name, collection, read preference mode) for every command"""
+
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        mode = event.command.get('$readPreference', {}).get('mode', 'primary')
+        self.commands.append((event.command_name, event.command.get(event.command_name), mode))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def modes(self, command_name, collection):
+        return {
+            mode for name, target, mode in self.commands
+            if name == command_name and target == collection
+        }
+
+
+recorder = ReadModeRecorder()
+
+
+def request(path):
+    employee_cache.clear()
+    get_cache().clear()
+    recorder.commands.clear()
+    return APIClient().get(path)
+
+
+def server_available():
+    """True when a MongoDB server answers at TEST_HOST within a second"""
+    client = MongoClient(TEST_HOST, serverSelectionTimeoutMS=1000)
+    try:
+        client.server_info()
+        return True
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+
+
+def setup_module(module):
+    if not server_available():
+        import pytest
+        pytest.skip(f'No MongoDB server reachable at {TEST_HOST}', allow_module_level=True)
+    mongoengine.disconnect()
+    mongoengine.connect(db=TEST_DB, host=TEST_HOST, event_listeners=[recorder])
+    employee = Employee.objects.create(employeeId='R0001', full_name='Read Test', email='r1@example.com')
+    Attendance.objects.create(employee=employee, date=date.today(), status='Present')
+
+
+def teardown_module(module):
+    mongoengine.connection.get_connection().drop_database(TEST_DB)
+    mongoengine.disconnect()
+
+
+def test_reads_default_to_primary():
+    """Without configuration every read goes to the primary"""
+    assert request('/api/attendance/').status_code == 200
+    assert recorder.modes('find', 'attendance') == {'primary'}
+
+
+@override_settings(API_READ_PREFERENCES=SECONDARY_READS)
+def test_list_and_reporting_reads_use_configured_preference():
+    """Configured endpoints send their read preference with the query"""
+    assert request('/api/employees/').status_code == 200
+    assert recorder.modes('find', 'employees') == {'secondaryPreferred'}
+
+    assert request('/api/attendance/').status_code == 200
+    assert recorder.modes('find', 'attendance') == {'secondaryPreferred'}
+
+    assert request('/api/employees/R0001/attendance/').status_code == 200
+    assert recorder.modes('aggregate', 'attendance') == {'secondaryPreferred'}
+    assert recorder.modes('find', 'attendance') == {'secondaryPreferred'}
+
+    response = request('/api/attendance/export/?format=ndjson')
+    assert response.status_code == 200
+    b''.join(response.streaming_content)
+    assert recorder.modes('find', 'attendance') == {'secondaryPreferred'}
+
+
+@override_settings(API_READ_PREFERENCES=SECONDARY_READS)
+def test_writes_stay_on_primary():
+    """Writes and write-path lookups ignore the endpoint read preferences"""
+    recorder.commands.clear()
+    response = APIClient().put('/api/attendance/mark/', {
+        'employeeId': 'R0001', 'date': date.today().isoformat(), 'status': 'Absent'
+    }, format='json')
+
+    assert response.status_code in (200, 201)
+    assert {mode for _, _, mode in recorder.commands} == {'primary'}
+
+
+if __name__ == "__main__":
+    if not server_available():
+        raise SystemExit(f'No MongoDB server reachable at {TEST_HOST}')
+    setup_module(None)
+    try:
+        test_reads_default_to_primary()
+        test_list_and_reporting_reads_use_configured_preference()
+        test_writes_stay_on_primary()
+        print("✓ Read preference routing OK")
+    finally:
+        teardown_module(None)
@@ -0,0 +1,56 @@
+"""
+Read preference settings tests (no database needed):
+
+    python -m pytest test_read_preference_settings.py
+"""
+import os
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from pymongo.read_preferences import Primary
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees.read_preference import check_settings, read_preference  # noqa: E402
+
+ALL_PRIMARY = {'employee_list': 'primary', 'attendance_list': 'primary'}
+SECONDARY_LIST = {'employee_list': 'secondaryPreferred', 'attendance_list': 'primary'}
+
+
+def assert_rejected(**overrides):
+    with override_settings(**overrides):
+        try:
+            check_settings()
+        except ImproperlyConfigured:
+            return
+    raise AssertionError(f'{overrides} was accepted')
+
+
+def test_max_staleness_is_applied_to_secondary_reads():
+    with override_settings(API_READ_PREFERENCES=SECONDARY_LIST, READ_PREFERENCE_MAX_STALENESS_SECONDS=120):
+        check_settings()
+        assert read_preference('employee_list').max_staleness == 120
+        assert isinstance(read_preference('attendance_list'), Primary)
+
+
+def test_max_staleness_below_the_server_minimum_is_rejected():
+    # Rejected even when every endpoint reads from the primary
+    for max_staleness in (0, 1, 89):
+        assert_rejected(API_READ_PREFERENCES=ALL_PRIMARY, READ_PREFERENCE_MAX_STALENESS_SECONDS=max_staleness)
+        assert_rejected(API_READ_PREFERENCES=SECONDARY_LIST, READ_PREFERENCE_MAX_STALENESS_SECONDS=max_staleness)
+    for max_staleness in (-1, 90):
+        with override_settings(API_READ_PREFERENCES=ALL_PRIMARY, READ_PREFERENCE_MAX_STALENESS_SECONDS=max_staleness):
+            check_settings()
+
+
+def test_unknown_read_preference_is_rejected():
+    assert_rejected(API_READ_PREFERENCES={'employee_list': 'secondaryish'}, READ_PREFERENCE_MAX_STALENESS_SECONDS=-1)
+
+
+if __name__ == "__main__":
+    test_max_staleness_is_applied_to_secondary_reads()
+    test_max_staleness_below_the_server_minimum_is_rejected()
+    test_unknown_read_preference_is_rejected()
+    print("✓ Read preference settings OK")
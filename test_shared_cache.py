@@ -0,0 +1,128 @@
+"""
+Shared cache tests (no database needed):
+
+    python -m pytest test_shared_cache.py
+
+Two processes use one file-based cache, as two gunicorn workers do: a version
+bump in one must make the other miss the responses it cached earlier. The
+async helpers must do their (blocking) cache calls outside the event loop.
+"""
+import asyncio
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import django
+from django.test import RequestFactory, override_settings
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+
+from employees.shared_cache import (  # noqa: E402
+    EMPLOYEES,
+    alookup_response,
+    astore_response,
+    employee_scope,
+    get_version,
+    lookup_response,
+    store_response,
+)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Run in a second process: bump the given scopes in the cache at CACHE_LOCATION
+WRITER = """
+import os, sys
+import django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_management.settings')
+django.setup()
+from employees.shared_cache import bump_version
+bump_version(*sys.argv[1:])
+"""
+
+
+def file_cache(location):
+    return override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': location,
+        'KEY_PREFIX': 'emp',
+    }})
+
+
+def bump_in_other_process(location, *scopes):
+    environment = dict(os.environ, CACHE_BACKEND='file', CACHE_LOCATION=location)
+    subprocess.run([sys.executable, '-c', WRITER, *scopes], env=environment, check=True, cwd=PROJECT_DIR)
+
+
+def test_write_in_another_process_invalidates_cached_responses():
+    request = RequestFactory().get('/api/employees/', SERVER_NAME='localhost')
+    with tempfile.TemporaryDirectory() as location, file_cache(location):
+        cache_key, _, data = lookup_response(request, (EMPLOYEES,))
+        assert data is None
+        store_response(cache_key, {'success': True, 'data': []})
+        assert lookup_response(request, (EMPLOYEES,))[2] == {'success': True, 'data': []}
+
+        bump_in_other_process(location, EMPLOYEES)
+
+        new_key, _, data = lookup_response(request, (EMPLOYEES,))
+        assert new_key != cache_key
+        assert data is None
+
+
+def test_per_employee_versions_are_shared():
+    scope = employee_scope('507f1f77bcf86cd799439011')
+    with tempfile.TemporaryDirectory() as location, file_cache(location):
+        before = get_version(scope)
+        other = get_version(EMPLOYEES)
+        bump_in_other_process(location, scope)
+        assert get_version(scope) != before
+        assert get_version(EMPLOYEES) == other
+
+
+def test_async_helpers_keep_cache_calls_off_the_event_loop():
+    request = RequestFactory().get('/api/employees/', SERVER_NAME='localhost')
+    threads = set()
+
+    def record_thread(*args, **kwargs):
+        threads.add(threading.get_ident())
+        return {}
+
+    async def lookup_and_store():
+        cache_key, _, data = await alookup_response(request, (EMPLOYEES,))
+        await astore_response(cache_key, {'success': True, 'data': []})
+        return threading.get_ident(), data
+
+    cache = mock.Mock(get=record_thread, get_many=record_thread, add=record_thread, set=record_thread)
+    with mock.patch('employees.shared_cache.get_cache', return_value=cache):
+        loop_thread, data = asyncio.run(lookup_and_store())
+    assert data == {}
+    assert threads and loop_thread not in threads
+
+
+def test_gunicorn_refuses_locmem_with_several_workers():
+    server = SimpleNamespace(cfg=SimpleNamespace(workers=2))
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        environment = {'CACHE_BACKEND': 'locmem', 'PROMETHEUS_MULTIPROC_DIR': metrics_dir}
+        with mock.patch.dict(os.environ, environment):
+            config = runpy.run_path(os.path.join(PROJECT_DIR, 'gunicorn.conf.py'))
+            try:
+                config['on_starting'](server)
+            except RuntimeError as e:
+                assert 'locmem' in str(e)
+            else:
+                raise AssertionError('several workers started with a per-process cache')
+            server.cfg.workers = 1
+            config['on_starting'](server)
+
+
+if __name__ == "__main__":
+    test_write_in_another_process_invalidates_cached_responses()
+    test_per_employee_versions_are_shared()
+    test_async_helpers_keep_cache_calls_off_the_event_loop()
+    test_gunicorn_refuses_locmem_with_several_workers()
+    print("✓ Shared cache OK")